@@ -0,0 +1,116 @@
+"""Compara tamaño y velocidad de lectura de articles.db con el contenido sin comprimir y comprimido.
+
+Arma una base con --rows artículos (el contenido real de articles.db repetido, o
+texto sintético si no existe), crea una copia por códec con compress_content y
+mide iter_articles completo en frío: antes de cada lectura se descartan las
+páginas del archivo de la caché del sistema (posix_fadvise) y se abre un
+DatabaseManager nuevo, así que la caché de SQLite también empieza vacía.
+
+Uso: python benchmarks/bench_compression.py [--rows 20000] [--runs 3] [--source articles.db]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fixture_server import FixtureBlog
+from database import DatabaseManager, decompress_text, resolve_codec, zstandard
+
+MB = 1024 * 1024
+
+
+def source_contents(path):
+    if path and os.path.exists(path):
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+            contents = [decompress_text(row[0]) for row in conn.execute("SELECT content FROM articles")]
+        if contents:
+            return contents
+    rng = random.Random(42)
+    return ["\n\n".join(FixtureBlog._sentence(rng, rng.randint(40, 90)) for _ in range(12)) for _ in range(50)]
+
+
+def build(path, rows, contents):
+    db = DatabaseManager(path)
+    db.save_articles(({
+        'title': f"Artículo {i}",
+        'content': contents[i % len(contents)],
+        'url': f"https://example.com/articulo-{i}/",
+        'date': "2023-03-15"
+    } for i in range(rows)))
+    db.vacuum()
+    db.engine.dispose()
+
+
+def drop_cache(path):
+    # Solo descarta páginas ya escritas a disco; en sistemas sin fadvise la lectura queda en caliente
+    for name in (path, f"{path}-wal"):
+        if os.path.exists(name) and hasattr(os, "posix_fadvise"):
+            fd = os.open(name, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+
+def read_all(path, cold):
+    if cold:
+        drop_cache(path)
+    db = DatabaseManager(path)
+    start = time.perf_counter()
+    rows = chars = 0
+    for article in db.iter_articles():
+        rows += 1
+        chars += len(article['content'])
+    elapsed = time.perf_counter() - start
+    db.engine.dispose()
+    return rows, chars, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--source", default=os.path.join(ROOT, "articles.db"),
+                        help="Base de la que tomar contenido real (si no existe, texto sintético)")
+    args = parser.parse_args()
+
+    codecs = [None, "zlib"] + (["zstd"] if zstandard else [])
+    if not zstandard:
+        print("(zstandard no está instalado: se omite zstd)")
+    contents = source_contents(args.source)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = os.path.join(tmp, "plain.db")
+        build(plain, args.rows, contents)
+        print(f"{'códec':<8} {'archivo':>10} {'contenido':>10} {'frío':>14} {'caliente':>14}")
+        for codec in codecs:
+            path = os.path.join(tmp, f"{codec or 'plain'}.db")
+            content_size = None
+            if codec:
+                shutil.copy(plain, path)
+                db = DatabaseManager(path)
+                _, _, content_size = db.compress_content(resolve_codec(codec))
+                db.vacuum()
+                db.engine.dispose()
+            cold = [read_all(path, cold=True) for _ in range(args.runs)]
+            warm = [read_all(path, cold=False) for _ in range(args.runs)]
+            rows, chars = cold[0][:2]
+            cold_s = statistics.median(run[2] for run in cold)
+            warm_s = statistics.median(run[2] for run in warm)
+            if content_size is None:
+                content_size = sum(len(c.encode("utf-8")) for c in contents) * rows // len(contents)
+            print(f"{codec or 'ninguno':<8} {os.path.getsize(path) / MB:8.1f} MB {content_size / MB:7.1f} MB "
+                  f"{rows / cold_s:9.0f} fil/s {rows / warm_s:9.0f} fil/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compara filas/segundo entre save_article (una transacción por fila) y save_articles.
+
+Uso: python benchmarks/bench_db_writes.py [--rows 2000] [--batch-size 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+
+
+def make_articles(count, revision=0):
+    return [{
+        'title': f"Artículo de prueba {i}",
+        'content': f"Revisión {revision}. " + "Contenido del artículo. " * 200,
+        'url': f"https://example.com/articulo-{i}/",
+        'date': "2023-03-15"
+    } for i in range(count)]
+
+
+def timed(label, rows, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f} s {rows / elapsed:12.0f} filas/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    articles = make_articles(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, 'per_row.db'))
+        timed("save_article (por fila)", args.rows,
+              lambda: [db.save_article(article) for article in articles])
+
+        db = DatabaseManager(os.path.join(tmp, 'bulk.db'))
+        timed("save_articles (inserción)", args.rows,
+              lambda: db.save_articles(articles, args.batch_size))
+        timed("save_articles (sin cambios)", args.rows,
+              lambda: db.save_articles(articles, args.batch_size))
+        changed = make_articles(args.rows, revision=1)
+        timed("save_articles (todo modificado)", args.rows,
+              lambda: db.save_articles(changed, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
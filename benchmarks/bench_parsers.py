@@ -0,0 +1,73 @@
+"""Micro-benchmark de los backends de parseo sobre las páginas guardadas en fixtures/.
+
+Uso: python benchmarks/bench_parsers.py [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import parsers
+from config import SELECTORS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def extract_article(doc):
+    title = next((el.text.strip() for sel in SELECTORS["title"] if (el := doc.select_one(sel))), "")
+    content = next(("\n".join(p.text.strip() for p in el.find_all("p"))
+                    for sel in SELECTORS["content"] if (el := doc.select_one(sel))), "")
+    date = next((el.get('datetime') or el.text.strip()
+                 for sel in SELECTORS["date"] if (el := doc.select_one(sel))), "")
+    return title, content, date
+
+
+def extract_listing(doc):
+    links = [a.get('href') for sel in SELECTORS["article_links"] for a in doc.select(sel)]
+    next_page = next((el.get('href') for sel in SELECTORS["next_page"] if (el := doc.select_one(sel))), None)
+    return links, next_page
+
+
+def variants(selectors):
+    scope = parsers.build_scope(selectors)
+    # Referencia: lo que hacía _get_soup antes (texto decodificado + html.parser)
+    yield "html.parser (texto, sin acotar)", lambda body: BeautifulSoup(body.decode('utf-8'), 'html.parser')
+    yield "html.parser (bytes, acotado)", lambda body: parsers.parse_html(body, scope=scope, backend="html.parser")
+    if parsers.HAS_LXML:
+        yield "lxml (bytes, sin acotar)", lambda body: parsers.parse_html(body, backend="lxml")
+        yield "lxml (bytes, acotado)", lambda body: parsers.parse_html(body, scope=scope, backend="lxml")
+    if parsers.LexborHTMLParser is not None:
+        yield "selectolax", lambda body: parsers.parse_html(body, backend="selectolax")
+
+
+def run(name, selectors, extract, repeat):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        body = f.read()
+    print(f"\n{name} ({len(body) / 1024:.0f} KiB)")
+    reference = None
+    for label, parse in variants(selectors):
+        result = extract(parse(body))
+        reference = reference or result
+        start = time.perf_counter()
+        for _ in range(repeat):
+            extract(parse(body))
+        elapsed = (time.perf_counter() - start) / repeat
+        status = "ok" if result == reference else "DIFIERE"
+        print(f"  {label:<34} {elapsed * 1000:8.2f} ms/página  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    run('article.html', SELECTORS["title"] + SELECTORS["content"] + SELECTORS["date"], extract_article, args.repeat)
+    run('listing.html', SELECTORS["article_links"] + SELECTORS["next_page"], extract_listing, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Control de regresión del arranque del CLI: import de main.py y comando stats en frío.
+
+Compara el tiempo de `python -c "import main"` y de `main.py stats` con el de un
+intérprete vacío (`python -c pass`) medido en la misma corrida, así el límite es
+una proporción y no depende de la máquina. También comprueba con `-X importtime`
+que `import main` no cargue los módulos pesados que solo usan scrape/generate/search.
+Sale con código 1 si algo falla, para usarlo en CI o antes de un release.
+
+Uso: python benchmarks/bench_startup.py [--max-import-ratio 3] [--max-stats-ratio 4] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Ninguno de estos debe cargarse solo por importar main
+HEAVY_MODULES = ("sqlalchemy", "requests", "bs4", "reportlab", "docx", "lxml", "dateparser", "selectolax")
+
+
+def import_profile():
+    """Devuelve ({módulo: µs acumulados}) de un `import main` en un proceso nuevo."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        if cum.strip().isdigit():
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+
+def wall_time_ms(args, cwd, runs):
+    """Mediana en ms de ejecutar `python <args>` en un proceso nuevo."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-import-ratio", type=float, default=3,
+                        help="Límite de `import main` respecto de un intérprete vacío (mediana)")
+    parser.add_argument("--max-stats-ratio", type=float, default=4,
+                        help="Límite de `main.py stats` de punta a punta respecto de un intérprete vacío (mediana)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    baseline_ms = wall_time_ms(["-c", "pass"], ROOT, args.runs)
+    print(f"{'python -c pass':<24} {baseline_ms:8.1f} ms (base)")
+
+    import_ms = wall_time_ms(["-c", "import main"], ROOT, args.runs)
+    ratio = import_ms / baseline_ms
+    print(f"{'import main':<24} {import_ms:8.1f} ms {ratio:5.2f}x (límite {args.max_import_ratio:g}x)")
+    if ratio > args.max_import_ratio:
+        failures.append(f"import main tarda {ratio:.2f}x lo que un intérprete vacío")
+
+    profile = import_profile()
+    print(f"{'  según -X importtime':<24} {profile['main'] / 1000:8.1f} ms")
+    heavy = sorted({name for name in profile if name.split(".")[0] in HEAVY_MODULES})
+    if heavy:
+        failures.append(f"import main carga módulos pesados: {', '.join(heavy[:10])}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from database import DatabaseManager
+        db_path = os.path.join(tmp, "articles.db")
+        DatabaseManager(db_path).save_articles([{
+            'title': f"Artículo {i}", 'content': "Contenido", 'url': f"https://example.com/{i}/", 'date': "2023-03-15"
+        } for i in range(100)])
+        stats_ms = wall_time_ms([os.path.join(ROOT, "main.py"), "stats", "--json"], tmp, args.runs)
+    ratio = stats_ms / baseline_ms
+    print(f"{'main.py stats':<24} {stats_ms:8.1f} ms {ratio:5.2f}x (límite {args.max_stats_ratio:g}x)")
+    if ratio > args.max_stats_ratio:
+        failures.append(f"main.py stats tarda {ratio:.2f}x lo que un intérprete vacío")
+
+    for failure in failures:
+        print(f"REGRESIÓN: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
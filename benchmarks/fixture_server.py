@@ -0,0 +1,184 @@
+"""Servidor HTTP local que simula un blog WordPress compatible con los SELECTORS de config.py.
+
+Uso: python benchmarks/fixture_server.py --articles 500 [--per-page 10] [--port 8000]
+"""
+import argparse
+import math
+import random
+import threading
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "planta cultivo riego sustrato hoja raíz flor maceta luz abono interior exterior "
+    "temperatura humedad semilla poda esqueje germinación plaga hongo compost huerta"
+).split()
+MONTHS = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio",
+          "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+PAGE = """<!DOCTYPE html>
+<html lang="es-AR"><head><meta charset="UTF-8"><title>{title} &#8211; Blog de prueba</title>
+<link rel="stylesheet" href="/wp-content/themes/tema/style.css?ver=1.0">
+<script>window._wpemojiSettings = {{"ext":".png","svgExt":".svg"}};</script></head>
+<body class="wordpress"><div id="page" class="site">
+<header id="masthead" class="site-header"><nav class="main-navigation"><ul class="menu">{menu}</ul></nav></header>
+<div id="content" class="site-content"><main id="main" class="site-main">
+{main}
+</main><aside id="secondary" class="widget-area"><section class="widget"><ul>{sidebar}</ul></section></aside></div>
+<footer id="colophon" class="site-footer"><p>{footer}</p></footer></div></body></html>"""
+
+
+class FixtureBlog:
+    def __init__(self, articles: int, per_page: int = 10, paragraphs: int = 12, seed: int = 42,
+                 sitemap_size: int = 2000):
+        self.articles = articles
+        self.per_page = per_page
+        self.paragraphs = paragraphs
+        self.seed = seed
+        self.pages = max(1, math.ceil(articles / per_page))
+        self.sitemap_size = sitemap_size
+        self.sitemaps = max(1, math.ceil(articles / sitemap_size))
+        # índice -> lastmod (AAAA-MM-DDTHH:MM:SS+00:00) para simular artículos editados
+        self.modified = {}
+        rng = random.Random(seed)
+        self._menu = "".join(f'<li class="menu-item"><a href="/categoria/{w}/">{w}</a></li>' for w in WORDS)
+        self._sidebar = "".join(f'<li><a href="/articulo-{i}/">{self._sentence(rng, 6)}</a></li>' for i in range(15))
+        self._footer = self._sentence(rng, 40)
+
+    @staticmethod
+    def _sentence(rng: random.Random, words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def _page(self, title: str, main: str) -> bytes:
+        return PAGE.format(title=escape(title), menu=self._menu, main=main,
+                           sidebar=self._sidebar, footer=self._footer).encode('utf-8')
+
+    def article_title(self, index: int) -> str:
+        return f"Artículo de prueba número {index}"
+
+    def article(self, index: int) -> bytes:
+        rng = random.Random(self.seed * 100003 + index)
+        body = "\n".join(f"<p>{self._sentence(rng, rng.randint(40, 120))}</p>" for _ in range(self.paragraphs))
+        day, month, year = self._published(index)
+        title = self.article_title(index)
+        main = f"""<article class="post type-post status-publish">
+<header class="entry-header"><h1 class="entry-title">{escape(title)}</h1>
+<span class="posted-on"><time class="entry-date published" datetime="{year}-{month + 1:02d}-{day:02d}T10:00:00-03:00">{day} de {MONTHS[month]} de {year}</time></span></header>
+<div class="entry-content">
+{body}
+</div></article>"""
+        return self._page(title, main)
+
+    @staticmethod
+    def _published(index: int):
+        return 1 + index % 28, index % 12, 2015 + index % 9
+    
+    def lastmod(self, index: int) -> str:
+        day, month, year = self._published(index)
+        return self.modified.get(index, f"{year}-{month + 1:02d}-{day:02d}T10:00:00-03:00")
+
+    def sitemap_index(self) -> bytes:
+        children = [f"/wp-sitemap-posts-post-{n}.xml" for n in range(1, self.sitemaps + 1)]
+        children.append("/wp-sitemap-taxonomies-category-1.xml")
+        entries = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in children)
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">{entries}</sitemapindex>'.encode('utf-8')
+
+    def sitemap(self, number: int) -> bytes:
+        first = (number - 1) * self.sitemap_size
+        entries = "".join(
+            f"<url><loc>/articulo-{i}/</loc><lastmod>{self.lastmod(i)}</lastmod></url>"
+            for i in range(first, min(first + self.sitemap_size, self.articles))
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">{entries}</urlset>'.encode('utf-8')
+
+    def category_sitemap(self) -> bytes:
+        entries = "".join(f"<url><loc>/categoria/{w}/</loc></url>" for w in WORDS)
+        return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">{entries}</urlset>'.encode('utf-8')
+
+    def listing(self, page: int) -> bytes:
+        first = (page - 1) * self.per_page
+        items = "\n".join(
+            f'<article class="post-item"><h2 class="entry-title"><a href="/articulo-{i}/">{escape(self.article_title(i))}</a></h2>'
+            f'<div class="entry-summary"><p>Resumen del artículo {i}.</p></div></article>'
+            for i in range(first, min(first + self.per_page, self.articles))
+        )
+        nav = ""
+        if page < self.pages:
+            nav = f'<nav class="pagination"><a class="next page-numbers" href="/page/{page + 1}/">Siguiente</a></nav>'
+        return self._page("Blog", items + nav)
+
+    def render(self, path: str):
+        path = path.split('?', 1)[0].strip('/')
+        parts = path.split('/') if path else []
+        try:
+            if not parts:
+                return self.listing(1)
+            if parts == ['wp-sitemap.xml']:
+                return self.sitemap_index()
+            if parts == ['wp-sitemap-taxonomies-category-1.xml']:
+                return self.category_sitemap()
+            if len(parts) == 1 and parts[0].startswith('wp-sitemap-posts-post-') and parts[0].endswith('.xml'):
+                number = int(parts[0][len('wp-sitemap-posts-post-'):-len('.xml')])
+                if 1 <= number <= self.sitemaps:
+                    return self.sitemap(number)
+            if parts[0] == 'page' and len(parts) == 2 and 1 <= int(parts[1]) <= self.pages:
+                return self.listing(int(parts[1]))
+            if len(parts) == 1 and parts[0].startswith('articulo-'):
+                index = int(parts[0][len('articulo-'):])
+                if 0 <= index < self.articles:
+                    return self.article(index)
+        except ValueError:
+            pass
+        return None
+
+
+def make_handler(blog: FixtureBlog):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = blog.render(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            content_type = "application/xml" if self.path.endswith('.xml') else "text/html"
+            self.send_header("Content-Type", f"{content_type}; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(blog: FixtureBlog, port: int = 0):
+    """Arranca el servidor en un hilo y devuelve (servidor, URL base)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(blog))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    blog = FixtureBlog(args.articles, args.per_page)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(blog))
+    print(f"Blog de prueba con {args.articles} artículos en http://127.0.0.1:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
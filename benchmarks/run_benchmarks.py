@@ -0,0 +1,174 @@
+"""Benchmark de punta a punta contra un blog local: descubrimiento (listado y sitemap), extracción, base de datos y generadores.
+
+Cada tamaño de corpus corre en su propio proceso para que el pico de RSS sea
+comparable; el RSS de cada etapa es el pico acumulado al terminarla. Los
+resultados se guardan como JSON en benchmarks/results/.
+
+Uso: python benchmarks/run_benchmarks.py [--sizes 100,500,1000] [--concurrency 8]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def peak_rss_mb() -> float:
+    # En Linux ru_maxrss viene en KiB; en macOS, en bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Stages:
+    def __init__(self):
+        self.results = {}
+
+    def run(self, name, func, unit="artículos"):
+        start = time.perf_counter()
+        count = func()
+        elapsed = time.perf_counter() - start
+        self.results[name] = {
+            "seconds": round(elapsed, 4),
+            "items": count,
+            "unit": unit,
+            "per_second": round(count / elapsed, 2) if elapsed else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1)
+        }
+        return count
+
+
+def run_single(size: int, concurrency: int, workers: int) -> dict:
+    from fixture_server import FixtureBlog, serve
+    from database import DatabaseManager
+    from generators import DOCXGenerator, PDFGenerator, generate_formats
+    from scraper import BlogScraper
+
+    blog = FixtureBlog(size)
+    server, base_url = serve(blog)
+    stages = Stages()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseManager(os.path.join(tmp, 'bench.db'))
+            scraper = BlogScraper(db, concurrency=concurrency, use_cache=False,
+                                  base_url=base_url, max_pages=blog.pages, rate_limit=None)
+
+            links = []
+
+            def discover():
+                links.extend(scraper.get_all_article_links())
+                return len(links)
+            stages.run("discovery", discover, "enlaces")
+            stages.run("discovery_sitemap",
+                       lambda: sum(len(entries) for _, entries in scraper.iter_sitemap_urls()), "enlaces")
+
+            articles = []
+
+            def extract():
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    articles.extend(a for a in executor.map(scraper._extract_article, links) if a)
+                return len(articles)
+            stages.run("extraction", extract)
+
+            stages.run("db_write", lambda: len(db.save_articles(articles)))
+            del articles[:]
+            stages.run("db_read", lambda: sum(1 for _ in db.iter_articles()))
+
+            pdf_path = os.path.join(tmp, 'libro.pdf')
+
+            def pdf():
+                PDFGenerator(db.iter_articles(), pdf_path, workers=workers).generate()
+                return size
+            stages.run("pdf", pdf)
+
+            def docx(streaming):
+                DOCXGenerator(db.iter_articles(), os.path.join(tmp, 'libro.docx'), streaming=streaming).generate()
+                return size
+            stages.run("docx", lambda: docx(False))
+            stages.run("docx_streaming", lambda: docx(True))
+
+            def pdf_docx():
+                # Una sola lectura repartida a los dos generadores en procesos separados
+                generate_formats(db.iter_articles(), ['pdf', 'docx'], os.path.join(tmp, 'libro'), workers=workers)
+                return size
+            stages.run("pdf+docx", pdf_docx)
+    finally:
+        server.shutdown()
+
+    return {"articles": size, "stages": stages.results, "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_table(runs):
+    print(f"\n{'artículos':>10} {'etapa':<18} {'segundos':>10} {'por segundo':>12} {'RSS pico MB':>12}")
+    for run in runs:
+        for name, stage in run["stages"].items():
+            per_second = stage["per_second"] if stage["per_second"] is not None else float('nan')
+            print(f"{run['articles']:>10} {name:<18} {stage['seconds']:>10.3f} "
+                  f"{per_second:>12.1f} {stage['peak_rss_mb']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,500,1000", help="Tamaños de corpus separados por comas")
+    parser.add_argument("--concurrency", type=int, default=8, help="Descargas simultáneas del scraper")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para el PDF")
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto benchmarks/results/<fecha>.json)")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.single:
+        json.dump(run_single(args.single, args.concurrency, args.workers), sys.stdout)
+        return
+
+    runs = []
+    for size in (int(value) for value in args.sizes.split(',')):
+        print(f"Corpus de {size} artículos...", flush=True)
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--single", str(size),
+             "--concurrency", str(args.concurrency), "--workers", str(args.workers)],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout))
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "runs": runs
+    }
+    print_table(runs)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from metrics import registry as metrics
+
+logger = logging.getLogger(__name__)
+
+
+def declared_encoding(response) -> Optional[str]:
+    # requests supone ISO-8859-1 si el Content-Type no trae charset; en ese caso
+    # es mejor dejar que el parser detecte la codificación del propio HTML
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return None
+
+
+class DiskCache:
+    """Caché en disco clave -> (bytes, metadatos) con límite de tamaño y expulsión LRU."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith('.body'):
+                    self._sizes[name[:-5]] = os.path.getsize(os.path.join(root, name))
+        self.total_bytes = sum(self._sizes.values())
+
+    def _paths(self, digest: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, digest[:2], digest)
+        return f"{base}.body", f"{base}.json"
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict]]:
+        body_path, meta_path = self._paths(self._digest(key))
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        self._touch(body_path)
+        return body, meta
+
+    def put(self, key: str, body: bytes, meta: Dict):
+        digest = self._digest(key)
+        body_path, meta_path = self._paths(digest)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+        self._write(body_path, body)
+        with self._lock:
+            self.total_bytes += len(body) - self._sizes.get(digest, 0)
+            self._sizes[digest] = len(body)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def put_meta(self, key: str, meta: Dict):
+        """Reemplaza solo los metadatos de una entrada existente (el cuerpo no cambia)."""
+        body_path, meta_path = self._paths(self._digest(key))
+        if os.path.exists(body_path):
+            self._write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        # Escritura atómica: primero a un temporal y después se reemplaza
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def touch(self, key: str):
+        self._touch(self._paths(self._digest(key))[0])
+
+    def _touch(self, path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        # La fecha de modificación hace de marca de último uso
+        entries = []
+        for digest in self._sizes:
+            try:
+                entries.append((os.path.getmtime(self._paths(digest)[0]), digest))
+            except OSError:
+                entries.append((0, digest))
+        for _, digest in sorted(entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            for path in self._paths(digest):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.total_bytes -= self._sizes.pop(digest)
+
+
+class ResponseCache(DiskCache):
+    """Guarda cuerpos HTTP con su ETag/Last-Modified para peticiones condicionales."""
+
+    def __init__(self, directory: str, max_bytes: int, max_age: int = 0):
+        super().__init__(directory, max_bytes)
+        self.max_age = max_age
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def count(self, event: str):
+        with self._stats_lock:
+            self.stats[event] += 1
+        metrics.inc(f'http_cache_{event}_total')
+
+    def is_fresh(self, meta: Dict) -> bool:
+        return bool(self.max_age) and time.time() - meta.get('stored_at', 0) < self.max_age
+
+    @staticmethod
+    def conditional_headers(meta: Dict) -> Dict[str, str]:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url: str, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        # Sin validadores solo tiene sentido guardar si se permite servir sin revalidar
+        if not (etag or last_modified or self.max_age):
+            return
+        self.put(url, response.content, {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': declared_encoding(response),
+            'stored_at': time.time()
+        })
+
+    def revalidated(self, url: str, meta: Dict, response):
+        """Tras un 304 la entrada vuelve a estar fresca; el servidor puede mandar validadores nuevos."""
+        self.put_meta(url, {
+            **meta,
+            'etag': response.headers.get('ETag') or meta.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or meta.get('last_modified'),
+            'stored_at': time.time()
+        })
+
+    def log_stats(self):
+        logger.info(
+            f"Caché HTTP: {self.stats['hit']} aciertos, {self.stats['not_modified']} revalidados (304), "
+            f"{self.stats['miss']} descargas completas"
+        )
@@ -1,7 +1,81 @@
 BASE_URL = "https://cultivoloco.com.ar/"
 OUTPUT_FILENAME = "libro_blog"
+# Formatos de generate --format; se pueden pedir varios separados por comas (pdf,docx)
+OUTPUT_FORMATS = ("pdf", "docx")
 MAX_PAGES = 20
 
+# Perfiles de sitio (sites/<nombre>.json) para scrape --sites; lo que un perfil no
+# define se toma de este archivo. Sin --sites se rastrea DEFAULT_SITE con BASE_URL
+SITES_DIR = "sites"
+DEFAULT_SITE = "cultivoloco"
+
+# Parser HTML: "auto" elige selectolax, luego lxml y por último html.parser
+HTML_PARSER = "auto"
+
+# Límite de peticiones por host (token bucket); reemplaza la pausa aleatoria fija.
+# Con "adaptive" la tasa parte de requests_per_second y se ajusta (AIMD) entre
+# min_rate y max_rate según la latencia y las respuestas 429/503
+RATE_LIMIT = {
+    "requests_per_second": 2.0,
+    "burst": 4,
+    "adaptive": True,
+    "min_rate": 0.5,
+    "max_rate": 8.0,
+    "increase": 0.25,
+    "decrease": 0.5,
+    "target_latency": 2.0  # Segundos; respuestas más lentas cuentan como congestión
+}
+
+# Reintentos HTTP: errores de conexión en urllib3; timeouts y estados transitorios en el
+# scraper, con espera exponencial con jitter (Retry-After manda si el servidor lo envía)
+HTTP_RETRY = {
+    "timeout": 15,
+    "attempts": 4,
+    "backoff": 1.0,
+    "backoff_max": 60,
+    "statuses": [429, 500, 502, 503, 504]
+}
+
+# Base de datos: archivo, tamaño de lote para escrituras masivas y PRAGMAs de SQLite
+DB_CONFIG = {
+    "path": "articles.db",
+    "batch_size": 200,
+    "flush_interval": 5,  # Segundos máximos que un artículo espera en el búfer
+    # Compresión de articles.content: None (texto plano), "zlib", "zstd" (requiere el
+    # paquete zstandard) o "auto" (zstd si está instalado, si no zlib). Las filas ya
+    # guardadas se leen con cualquier valor; `main.py compress-db` las reescribe
+    "compression": None,
+    "compression_level": None,  # None = nivel por defecto del códec (zlib 6, zstd 3)
+    "pragmas": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -20000  # En KiB (negativo), unos 20 MB
+    }
+}
+
+# Descubrimiento por sitemap: se usa la primera URL que responda; en los índices solo
+# se siguen los sitemaps hijos cuya URL coincide con `include` (entradas, no páginas ni etiquetas)
+SITEMAP = {
+    "urls": ["sitemap_index.xml", "wp-sitemap.xml", "sitemap.xml"],
+    "include": r"post-sitemap|posts-post"
+}
+
+# Frontera del rastreo en la base: reintentos con espera exponencial para URLs fallidas
+FRONTIER = {
+    "max_attempts": 3,
+    "retry_backoff": 5,  # Segundos antes del primer reintento; se duplica en cada intento
+    "retry_backoff_max": 300
+}
+
+# Caché HTTP en disco: se revalida con ETag / Last-Modified en cada ejecución
+HTTP_CACHE = {
+    "enabled": True,
+    "directory": ".http_cache",
+    "max_size_mb": 200,
+    "max_age": 0  # Segundos durante los que se usa una respuesta sin revalidar
+}
+
 SELECTORS = {
     "article_links": [
         "article.post-item h2 a",
@@ -62,4 +136,10 @@ PDF_CONFIG = {
         "logo_path": "logo.png",
         "website": "CultivoLoco.com.ar"
     }
-}
\ No newline at end of file
+}
+
+# Caché de renderizado del PDF: fragmentos por artículo para builds incrementales
+RENDER_CACHE = {
+    "directory": ".render_cache",
+    "max_size_mb": 500
+}
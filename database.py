@@ -1,45 +1,262 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime
+from sqlalchemy import bindparam, create_engine, delete, event, func, inspect, select, text, update, Column, Integer, String, Text, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import declarative_base, sessionmaker
-from datetime import datetime
+from sqlalchemy.sql import column, table
+from sqlalchemy.types import TypeDecorator
+from datetime import datetime, timedelta
+from config import DB_CONFIG, DEFAULT_SITE, FRONTIER
+from metrics import registry as metrics
+import hashlib
 import logging
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 
+# SQLite limita la cantidad de parámetros por consulta
+URL_BATCH_SIZE = 500
+
+# Se incrementa con cada cambio de esquema; las bases que ya están en esta versión
+# (PRAGMA user_version) se abren sin create_all ni migraciones
+SCHEMA_VERSION = 2
+
+# Columnas agregadas después de la primera versión de cada tabla (create_all no las agrega)
+_ADDED_COLUMNS = {
+    'articles': {'content_hash': 'VARCHAR(64)', 'site': 'VARCHAR(100)', 'lastmod': 'DATETIME'},
+    'crawl_frontier': {'base_url': 'VARCHAR(2000)'}
+}
+
+# Índice de texto completo sobre título y contenido; el rowid es el id del artículo
+FTS_TABLE = 'articles_fts'
+_fts = table(FTS_TABLE, column('rowid'))
+_FTS_DELETE = text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id")
+_FTS_INSERT = text(f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (:id, :title, :content)")
+
+# Primer byte de un contenido comprimido; el texto sin comprimir se guarda como TEXT
+_CODEC_TAGS = {'zlib': b'z', 'zstd': b's'}
+_TAG_CODECS = {tag: codec for codec, tag in _CODEC_TAGS.items()}
+
+def resolve_codec(name=None):
+    """Códec efectivo para `name` (por defecto DB_CONFIG["compression"]); None = sin comprimir."""
+    name = DB_CONFIG.get("compression") if name is None else name
+    if name in (None, 'none'):
+        return None
+    if name == 'auto':
+        return 'zstd' if zstandard else 'zlib'
+    if name not in _CODEC_TAGS:
+        raise ValueError(f"Compresión desconocida: {name} (use none, zlib, zstd o auto)")
+    if name == 'zstd' and zstandard is None:
+        logger.warning("El paquete zstandard no está instalado; se comprime con zlib")
+        return 'zlib'
+    return name
+
+def compress_text(value, codec, level=None):
+    """Comprime `value` con el prefijo del códec; si no se achica, lo deja como texto."""
+    if codec is None or value is None:
+        return value
+    raw = value.encode('utf-8')
+    if codec == 'zstd':
+        packed = zstandard.ZstdCompressor(level=level or 3).compress(raw)
+    else:
+        packed = zlib.compress(raw, level or 6)
+    if len(packed) + 1 >= len(raw):
+        return value
+    return _CODEC_TAGS[codec] + packed
+
+def decompress_text(value):
+    # Las filas en texto plano (anteriores a la compresión o muy cortas) se devuelven tal cual
+    if not isinstance(value, bytes):
+        return value
+    codec = _TAG_CODECS.get(value[:1])
+    if codec == 'zlib':
+        return zlib.decompress(value[1:]).decode('utf-8')
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("La base tiene contenido comprimido con zstd; instale el paquete zstandard")
+        return zstandard.ZstdDecompressor().decompress(value[1:]).decode('utf-8')
+    raise ValueError(f"Contenido con formato desconocido (prefijo {value[:1]!r})")
+
+def _stored_size(value):
+    return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+class CompressedText(TypeDecorator):
+    """Text que se guarda comprimido según DB_CONFIG["compression"] y se lee siempre como str."""
+    impl = Text
+    cache_ok = True
+
+    def __init__(self, codec=None, level=None):
+        super().__init__()
+        self.codec = resolve_codec(codec)
+        self.level = level or DB_CONFIG.get("compression_level")
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value, self.codec, self.level)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
 class Article(Base):
     __tablename__ = 'articles'
     
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
-    content = Column(Text, nullable=False)
+    content = Column(CompressedText(), nullable=False)
     url = Column(String(2000), unique=True, nullable=False)
     publish_date = Column(DateTime)
+    content_hash = Column(String(64))
+    site = Column(String(100), index=True)
+    # <lastmod> del sitemap con el que se guardó; updated_at marca el último cambio de contenido
+    lastmod = Column(DateTime)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+# Guarda el lastmod de una fila sin cambios de contenido; updated_at se reescribe con
+# su propio valor para que no se dispare onupdate
+_articles = Article.__table__
+_UPDATE_LASTMOD = (
+    update(_articles)
+    .where(_articles.c.url == bindparam('b_url'), _articles.c.lastmod.is_distinct_from(bindparam('b_lastmod')))
+    .values(lastmod=bindparam('b_lastmod'), updated_at=_articles.c.updated_at)
+)
+
+class FrontierUrl(Base):
+    """URL descubierta durante el rastreo: pending (por descargar o reintentar), done o failed."""
+    __tablename__ = 'crawl_frontier'
+    
+    id = Column(Integer, primary_key=True)
+    url = Column(String(2000), unique=True, nullable=False)
+    base_url = Column(String(2000), index=True)
+    state = Column(String(10), nullable=False, default='pending', index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(500))
+    next_attempt_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class CrawlState(Base):
+    """Cursor de la paginación; `cursor` es NULL cuando el listado ya se recorrió entero."""
+    __tablename__ = 'crawl_state'
+    
+    base_url = Column(String(2000), primary_key=True)
+    cursor = Column(String(2000))
+    pages = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in DB_CONFIG["pragmas"].items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+    # Para leer el contenido desde SQL (índice de búsqueda, compress-db)
+    dbapi_connection.create_function('decompress_content', 1, decompress_text, deterministic=True)
+
+def fts_query(text):
+    """Texto libre a consulta FTS5: cada palabra va entre comillas (todas deben aparecer).
+
+    Así los guiones, apóstrofos y operadores se buscan como texto; un * final se
+    mantiene como búsqueda por prefijo.
+    """
+    terms = []
+    for word in text.split():
+        stem = word.rstrip('*')
+        if stem:
+            terms.append('"' + stem.replace('"', '""') + '"' + ('*' if word != stem else ''))
+    return ' '.join(terms)
+
+def content_hash(article_data):
+    digest = hashlib.sha256()
+    for field in ('title', 'content', 'date'):
+        digest.update((article_data.get(field) or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
 class DatabaseManager:
-    def __init__(self, db_name='articles.db'):
+    def __init__(self, db_name=DB_CONFIG["path"]):
         self.engine = create_engine(f'sqlite:///{db_name}')
-        Base.metadata.create_all(self.engine)
+        event.listen(self.engine, 'connect', _set_sqlite_pragmas)
+        with self.engine.connect() as conn:
+            version = conn.execute(text("PRAGMA user_version")).scalar()
+        if version != SCHEMA_VERSION:
+            Base.metadata.create_all(self.engine)
+            self._migrate()
+            self._create_fts_index()
+            with self.engine.begin() as conn:
+                conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
         self.Session = sessionmaker(bind=self.engine)
     
+    def _migrate(self):
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table_name, added in _ADDED_COLUMNS.items():
+                columns = {col['name'] for col in inspector.get_columns(table_name)}
+                for name, ddl in added.items():
+                    if name not in columns:
+                        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl}"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_articles_site ON articles (site)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_crawl_frontier_base_url ON crawl_frontier (base_url)"))
+            # Bases de un solo sitio: todo pertenece al sitio por defecto y al único rastreo guardado
+            conn.execute(
+                update(Article).where(Article.site.is_(None))
+                .values(site=DEFAULT_SITE, updated_at=Article.updated_at)  # sin disparar onupdate
+            )
+            conn.execute(
+                update(FrontierUrl).where(FrontierUrl.base_url.is_(None))
+                .values(base_url=select(CrawlState.base_url).limit(1).scalar_subquery())
+            )
+    
+    def _create_fts_index(self):
+        # Bases creadas antes del índice: se crea y se llena una sola vez
+        if inspect(self.engine).has_table(FTS_TABLE):
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, content, "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            ))
+            indexed = conn.execute(text(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content) SELECT id, title, decompress_content(content) FROM articles"
+            )).rowcount
+        if indexed:
+            logger.info(f"Índice de búsqueda creado con {indexed} artículos")
+    
+    def _index_articles(self, session, rows):
+        # Las filas reescritas se borran y se vuelven a insertar en el índice
+        if rows:
+            session.execute(_FTS_DELETE, [{'id': row['id']} for row in rows])
+            session.execute(_FTS_INSERT, rows)
+    
+    def _article_row(self, article_data):
+        publish_date = None
+        if article_data.get('date'):
+            try:
+                publish_date = datetime.fromisoformat(article_data['date'])
+            except (TypeError, ValueError):
+                logger.warning(f"Formato de fecha inválido: {article_data['date']}")
+        
+        return {
+            'title': article_data['title'][:500],
+            'content': article_data['content'],
+            'url': article_data['url'][:2000],
+            'publish_date': publish_date,
+            'content_hash': content_hash(article_data),
+            'site': article_data.get('site') or DEFAULT_SITE,
+            'lastmod': article_data.get('lastmod')
+        }
+    
+    @metrics.timed('db_save_article_seconds')
     def save_article(self, article_data):
         session = self.Session()
         try:
-            publish_date = None
-            if article_data.get('date'):
-                try:
-                    publish_date = datetime.fromisoformat(article_data['date'])
-                except (TypeError, ValueError):
-                    logger.warning(f"Formato de fecha inválido: {article_data['date']}")
-            
-            article = Article(
-                title=article_data['title'][:500],
-                content=article_data['content'],
-                url=article_data['url'][:2000],
-                publish_date=publish_date
-            )
+            article = Article(**self._article_row(article_data))
             session.add(article)
+            session.flush()
+            self._index_articles(session, [{'id': article.id, 'title': article.title, 'content': article.content}])
             session.commit()
             return article
         except Exception as e:
@@ -49,21 +266,352 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def save_articles(self, batch, batch_size=None):
+        """Inserta o actualiza artículos por URL, en una transacción por lote.
+        
+        Solo se reescriben las filas cuyo hash de contenido cambió; de las demás
+        solo se guarda el lastmod del sitemap si avanzó. Devuelve el conjunto de
+        URLs insertadas o actualizadas; el índice de búsqueda se actualiza en la
+        misma transacción.
+        """
+        batch_size = batch_size or DB_CONFIG["batch_size"]
+        rows = [self._article_row(article) for article in batch]
+        stmt = sqlite_insert(Article)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Article.url],
+            set_={
+                'title': stmt.excluded.title,
+                'content': stmt.excluded.content,
+                'publish_date': stmt.excluded.publish_date,
+                'content_hash': stmt.excluded.content_hash,
+                'lastmod': func.coalesce(stmt.excluded.lastmod, Article.lastmod),
+                'updated_at': datetime.now()
+            },
+            where=Article.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        ).returning(Article.id, Article.url)
+        
+        written = set()
+        session = self.Session()
+        try:
+            for i in range(0, len(rows), batch_size):
+                with metrics.timer('db_save_batch_seconds'):
+                    chunk = rows[i:i + batch_size]
+                    ids = {url: id_ for id_, url in session.execute(stmt, chunk)}
+                    self._index_articles(session, [
+                        {'id': ids[row['url']], 'title': row['title'], 'content': row['content']}
+                        for row in chunk if row['url'] in ids
+                    ])
+                    # Contenido igual pero el sitemap lo marcó como modificado: sin guardar el
+                    # lastmod nuevo se volvería a descargar en cada rastreo
+                    checked = [
+                        {'b_url': row['url'], 'b_lastmod': row['lastmod']}
+                        for row in chunk if row['url'] not in ids and row['lastmod']
+                    ]
+                    if checked:
+                        session.execute(_UPDATE_LASTMOD, checked)
+                    written.update(ids)
+                    session.commit()
+            metrics.inc('db_rows_written_total', len(written))
+            return written
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error guardando lote de artículos: {str(e)}")
+            raise
+        finally:
+            session.close()
+    
+    @metrics.timed('db_get_all_articles_seconds')
     def get_all_articles(self):
+        return list(self.iter_articles())
+    
+    def _article_filters(self, date_from=None, date_to=None, id_from=None, id_to=None, query=None, site=None):
+        filters = []
+        if site:
+            filters.append(Article.site == site)
+        if query:
+            filters.append(Article.id.in_(
+                select(_fts.c.rowid).where(text(f"{FTS_TABLE} MATCH :query").bindparams(query=query))
+            ))
+        if date_from:
+            filters.append(Article.publish_date >= datetime.combine(date_from, datetime.min.time()))
+        if date_to:
+            filters.append(Article.publish_date < datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+        if id_from is not None:
+            filters.append(Article.id >= id_from)
+        if id_to is not None:
+            filters.append(Article.id <= id_to)
+        return filters
+    
+    def iter_articles(self, date_from=None, date_to=None, id_from=None, id_to=None, query=None, site=None,
+                      batch_size=None):
+        """Recorre los artículos ordenados por id sin cargarlos todos en memoria.
+        
+        Los rangos de fecha e id son inclusivos; `query` (sintaxis FTS5) limita
+        la lectura a los artículos que coinciden y `site` a los de un sitio. Se
+        leen `batch_size` filas por vez.
+        """
+        stmt = (
+            select(Article.title, Article.content, Article.url, Article.publish_date)
+            .where(*self._article_filters(date_from, date_to, id_from, id_to, query, site))
+            .order_by(Article.id)
+            .execution_options(yield_per=batch_size or DB_CONFIG["batch_size"])
+        )
+        with self.Session() as session:
+            # Se mide la lectura de cada lote, no el tiempo que el consumidor tarda en procesarlo
+            batches = metrics.timed_iter('db_read_batch_seconds', session.execute(stmt).partitions())
+            for batch in batches:
+                metrics.inc('db_rows_read_total', len(batch))
+                for title, content, url, publish_date in batch:
+                    yield {
+                        'title': title,
+                        'content': content,
+                        'url': url,
+                        'date': publish_date.strftime('%Y-%m-%d') if publish_date else 'Sin fecha'
+                    }
+    
+    def count_articles(self, date_from=None, date_to=None, id_from=None, id_to=None, query=None, site=None):
+        stmt = select(func.count(Article.id)).where(
+            *self._article_filters(date_from, date_to, id_from, id_to, query, site)
+        )
+        with self.Session() as session:
+            return session.execute(stmt).scalar()
+    
+    @metrics.timed('db_search_seconds')
+    def search(self, query, limit=20):
+        """Busca en título y contenido; devuelve los resultados ordenados por relevancia (bm25)."""
+        stmt = text(f"""
+            SELECT a.id, a.title, a.url, a.publish_date,
+                   snippet({FTS_TABLE}, 1, '[', ']', '…', 16) AS snippet
+            FROM {FTS_TABLE} JOIN articles a ON a.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :query
+            ORDER BY bm25({FTS_TABLE}, 10.0, 1.0)
+            LIMIT :limit
+        """)
+        with self.Session() as session:
+            return [
+                {
+                    'id': id_,
+                    'title': title,
+                    'url': url,
+                    'date': publish_date[:10] if publish_date else 'Sin fecha',
+                    'snippet': ' '.join(snippet.split())
+                }
+                for id_, title, url, publish_date, snippet in session.execute(stmt, {'query': query, 'limit': limit})
+            ]
+
+    def compress_content(self, codec=None, level=None, batch_size=None):
+        """Reescribe el contenido guardado con `codec` (None = texto plano), por lotes.
+
+        No toca updated_at ni content_hash. Devuelve (filas reescritas, bytes de
+        contenido antes, bytes después).
+        """
+        batch_size = batch_size or DB_CONFIG["batch_size"]
+        select_batch = text("SELECT id, content FROM articles WHERE id > :last ORDER BY id LIMIT :limit")
+        update_batch = text("UPDATE articles SET content = :content WHERE id = :id")
+        rewritten = size_before = size_after = 0
+        last_id = 0
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(select_batch, {'last': last_id, 'limit': batch_size}).all()
+                if not rows:
+                    break
+                changed = []
+                for id_, stored in rows:
+                    packed = compress_text(decompress_text(stored), codec, level)
+                    size_before += _stored_size(stored)
+                    size_after += _stored_size(packed)
+                    if packed != stored:
+                        changed.append({'id': id_, 'content': packed})
+                if changed:
+                    conn.execute(update_batch, changed)
+                rewritten += len(changed)
+                last_id = rows[-1][0]
+        return rewritten, size_before, size_after
+
+    def vacuum(self):
+        """Compacta el índice de búsqueda y el archivo (VACUUM no puede ir dentro de una transacción)."""
+        with self.engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text("VACUUM"))
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    def get_existing_urls(self, urls):
+        """Devuelve el subconjunto de `urls` ya guardado, con una consulta IN por lote."""
+        urls = list(urls)
+        existing = set()
         session = self.Session()
         try:
-            return [{
-                'title': art.title,
-                'content': art.content,
-                'url': art.url,
-                'date': art.publish_date.strftime('%Y-%m-%d') if art.publish_date else 'Sin fecha'
-            } for art in session.query(Article).all()]
+            for i in range(0, len(urls), URL_BATCH_SIZE):
+                batch = urls[i:i + URL_BATCH_SIZE]
+                existing.update(
+                    url for (url,) in session.query(Article.url).filter(Article.url.in_(batch))
+                )
+            return existing
         finally:
             session.close()
     
+    def get_lastmods(self, urls):
+        """Devuelve {url: lastmod} para las `urls` ya guardadas, con una consulta IN por lote.
+
+        Las filas guardadas antes de registrar el lastmod usan updated_at.
+        """
+        urls = list(urls)
+        lastmods = {}
+        with self.Session() as session:
+            for i in range(0, len(urls), URL_BATCH_SIZE):
+                batch = urls[i:i + URL_BATCH_SIZE]
+                lastmods.update(session.execute(
+                    select(Article.url, func.coalesce(Article.lastmod, Article.updated_at))
+                    .where(Article.url.in_(batch))
+                ).all())
+        return lastmods
+    
     def article_exists(self, url):
         session = self.Session()
         try:
             return session.query(Article).filter_by(url=url).count() > 0
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    def start_crawl(self, base_url):
+        """Vacía la frontera del sitio y pone el cursor al principio del listado."""
+        with self.Session() as session:
+            session.execute(delete(FrontierUrl).where(FrontierUrl.base_url == base_url))
+            session.merge(CrawlState(base_url=base_url, cursor=base_url, pages=0))
+            session.commit()
+    
+    def get_crawl_state(self, base_url):
+        """Devuelve (cursor, páginas recorridas) del último rastreo, o None si no hay."""
+        with self.Session() as session:
+            state = session.get(CrawlState, base_url)
+            return (state.cursor, state.pages) if state else None
+    
+    def add_to_frontier(self, base_url, urls, cursor, pages):
+        """Registra las URLs de una página del listado y avanza el cursor en la misma transacción.
+        
+        Devuelve solo las URLs que no estaban ya en la frontera.
+        """
+        added = []
+        with self.Session() as session:
+            if urls:
+                stmt = (
+                    sqlite_insert(FrontierUrl)
+                    .on_conflict_do_nothing(index_elements=[FrontierUrl.url])
+                    .returning(FrontierUrl.url)
+                )
+                rows = [{'url': url[:2000], 'base_url': base_url} for url in urls]
+                added = list(session.execute(stmt, rows).scalars())
+            session.merge(CrawlState(base_url=base_url, cursor=cursor, pages=pages))
+            session.commit()
+        return added
+    
+    def pending_frontier_urls(self, base_url, due_before=None):
+        """URLs pendientes del sitio en orden de descubrimiento; con `due_before`, solo reintentos ya vencidos."""
+        stmt = (
+            select(FrontierUrl.url)
+            .where(FrontierUrl.base_url == base_url, FrontierUrl.state == 'pending')
+            .order_by(FrontierUrl.id)
+        )
+        if due_before:
+            stmt = stmt.where(FrontierUrl.next_attempt_at <= due_before)
+        with self.Session() as session:
+            return list(session.execute(stmt).scalars())
+    
+    def next_frontier_attempt(self, base_url):
+        """Momento del próximo reintento programado del sitio, o None si no queda ninguno."""
+        stmt = select(func.min(FrontierUrl.next_attempt_at)).where(
+            FrontierUrl.base_url == base_url, FrontierUrl.state == 'pending', FrontierUrl.next_attempt_at.is_not(None)
+        )
+        with self.Session() as session:
+            return session.execute(stmt).scalar()
+    
+    def update_frontier(self, done, failed):
+        """Marca las URLs terminadas y programa reintentos para las fallidas.
+        
+        `failed` mapea URL -> error. Tras FRONTIER["max_attempts"] intentos la URL
+        queda en estado failed con su último error.
+        """
+        now = datetime.now()
+        with self.Session() as session:
+            for i in range(0, len(done), URL_BATCH_SIZE):
+                session.execute(
+                    update(FrontierUrl)
+                    .where(FrontierUrl.url.in_(done[i:i + URL_BATCH_SIZE]))
+                    .values(state='done', last_error=None, next_attempt_at=None, updated_at=now)
+                )
+            if failed:
+                rows = session.execute(select(FrontierUrl).where(FrontierUrl.url.in_(list(failed)))).scalars()
+                for row in rows:
+                    row.attempts += 1
+                    row.last_error = failed[row.url][:500]
+                    if row.attempts >= FRONTIER["max_attempts"]:
+                        row.state, row.next_attempt_at = 'failed', None
+                    else:
+                        backoff = min(FRONTIER["retry_backoff"] * 2 ** (row.attempts - 1), FRONTIER["retry_backoff_max"])
+                        row.next_attempt_at = now + timedelta(seconds=backoff)
+            session.commit()
+    
+    def count_frontier(self, base_url=None):
+        """Cantidad de URLs de la frontera por estado, de un sitio o de todos."""
+        stmt = select(FrontierUrl.state, func.count()).group_by(FrontierUrl.state)
+        if base_url:
+            stmt = stmt.where(FrontierUrl.base_url == base_url)
+        with self.Session() as session:
+            return dict(session.execute(stmt).all())
+
+class BatchWriter:
+    """Acumula artículos y los guarda con save_articles por lotes o cada cierto tiempo.
+    
+    Con `frontier=True` también acumula el resultado de cada URL (finish) y lo
+    registra en la frontera después de guardar los artículos: cada flush es un
+    punto de control desde el que se puede reanudar el rastreo. Es seguro
+    compartirlo entre hilos (un rastreo por sitio, un único escritor).
+    """
+    
+    def __init__(self, db, batch_size=None, flush_interval=None, frontier=False):
+        self.db = db
+        self.batch_size = batch_size or DB_CONFIG["batch_size"]
+        self.flush_interval = flush_interval if flush_interval is not None else DB_CONFIG["flush_interval"]
+        self.frontier = frontier
+        self.saved = []
+        self._buffer = []
+        self._done = []
+        self._failed = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+    
+    def add(self, article_data):
+        with self._lock:
+            self._buffer.append(article_data)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+    
+    def finish(self, url, error=None):
+        if not self.frontier:
+            return
+        with self._lock:
+            if error:
+                self._failed[url] = error
+            else:
+                self._done.append(url)
+    
+    def flush_if_stale(self):
+        with self._lock:
+            if (self._buffer or self._done or self._failed) and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+    
+    def flush(self):
+        with self._lock:
+            self._flush()
+    
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if self._buffer:
+            written = self.db.save_articles(self._buffer, self.batch_size)
+            self.saved.extend(article for article in self._buffer if article['url'] in written)
+            self._buffer = []
+        # La frontera se actualiza después de guardar: si el proceso muere en medio, las URLs se repiten, no se pierden
+        if self._done or self._failed:
+            self.db.update_frontier(self._done, self._failed)
+            self._done, self._failed = [], {}
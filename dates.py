@@ -0,0 +1,94 @@
+import logging
+import re
+import threading
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from metrics import registry as metrics
+
+logger = logging.getLogger(__name__)
+
+MONTHS_ES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
+}
+
+# Formatos fijos habituales en blogs en español, en orden día/mes/año
+_NUMERIC_DMY = re.compile(r'^(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})$')
+_NUMERIC_YMD = re.compile(r'^(\d{4})[/.](\d{1,2})[/.](\d{1,2})$')
+_TEXT_ES = re.compile(
+    r'^(?:[a-záéíóú]+,?\s+)?(\d{1,2})\s+(?:de\s+)?(' + '|'.join(MONTHS_ES) + r')\.?,?\s+(?:de\s+|del\s+)?(\d{4})$',
+    re.IGNORECASE
+)
+
+_dateparser = None
+
+
+def _parse_with_dateparser(value: str) -> Optional[date]:
+    # dateparser tarda en importarse; solo se carga si algún texto lo necesita
+    global _dateparser
+    if _dateparser is None:
+        import dateparser
+        _dateparser = dateparser
+    with metrics.timer('date_dateparser_seconds'):
+        parsed = _dateparser.parse(value, languages=['es'], settings={'DATE_ORDER': 'DMY'})
+    return parsed.date() if parsed else None
+
+
+class DateNormalizer:
+    """Convierte fechas de las páginas a ISO (AAAA-MM-DD) probando primero los caminos baratos."""
+
+    def __init__(self):
+        self.stats = Counter()
+        self._memo: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, value: str) -> str:
+        value = (value or '').strip()
+        if not value:
+            self._count('vacía')
+            return ""
+        with self._lock:
+            cached = self._memo.get(value)
+        if cached is not None:
+            self._count('memo')
+            return cached
+
+        path, parsed = self._parse(value)
+        self._count(path)
+        result = parsed.isoformat() if parsed else ""
+        with self._lock:
+            self._memo[value] = result
+        return result
+
+    def _parse(self, value: str):
+        try:
+            return 'iso', datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            pass
+
+        try:
+            if match := _NUMERIC_DMY.match(value):
+                day, month, year = map(int, match.groups())
+                return 'formato fijo', date(year, month, day)
+            if match := _NUMERIC_YMD.match(value):
+                year, month, day = map(int, match.groups())
+                return 'formato fijo', date(year, month, day)
+            if match := _TEXT_ES.match(value):
+                day, month, year = match.groups()
+                return 'formato fijo', date(int(year), MONTHS_ES[month.lower()], int(day))
+        except ValueError:
+            pass
+
+        parsed = _parse_with_dateparser(value)
+        return ('dateparser' if parsed else 'sin reconocer'), parsed
+
+    def _count(self, path: str):
+        with self._lock:
+            self.stats[path] += 1
+
+    def log_stats(self):
+        if self.stats:
+            summary = ", ".join(f"{path}: {count}" for path, count in self.stats.most_common())
+            logger.info(f"Fechas normalizadas por camino -> {summary}")
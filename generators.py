@@ -6,21 +6,149 @@ from reportlab.platypus import (
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.shared import Pt, RGBColor, Inches
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import hashlib
+import io
+import multiprocessing
+import json
 import logging
+from queue import Empty, Full
+import re
+import shutil
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
 from datetime import datetime
-from config import PDF_CONFIG
+from cache import DiskCache
+from config import PDF_CONFIG, RENDER_CACHE
+from metrics import registry as metrics
 import os
 
 logger = logging.getLogger(__name__)
 
+# Cambiar al modificar cómo se dibuja un artículo: invalida la caché de renderizado
+RENDER_VERSION = "1"
+
+class _FlowableStream(list):
+    """Lista de flowables que se rellena bajo demanda desde un iterador de bloques.
+
+    doc.build consume la lista por el frente (len, [0], del [0]), así que basta
+    con reponerla cuando se vacía para no tener el libro entero en memoria.
+    """
+
+    def __init__(self, chunks: Iterable[List]):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        if not list.__len__(self):
+            for chunk in self._chunks:
+                self.extend(chunk)
+                if list.__len__(self):
+                    break
+        return list.__len__(self)
+
+_DOCX_PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+# Caracteres de control que XML 1.0 no admite
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _docx_paragraph(text: str, style_id: str = None) -> str:
+    """XML de un párrafo equivalente a doc.add_paragraph(text, style)."""
+    style = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ''
+    # Igual que python-docx: los saltos de línea son <w:br/> y los tabs <w:tab/>
+    lines = []
+    for line in escape(_XML_INVALID.sub('', text)).split('\n'):
+        pieces = [f'<w:t xml:space="preserve">{piece}</w:t>' if piece else '' for piece in line.split('\t')]
+        lines.append('<w:tab/>'.join(pieces))
+    return f'<w:p>{style}<w:r>{"<w:br/>".join(lines)}</w:r></w:p>'
+
+class RenderCache(DiskCache):
+    """Fragmentos PDF por artículo, direccionados por contenido y estilo.
+
+    Las entradas viven en un subdirectorio por huella de PDF_CONFIG (más el logo
+    y RENDER_VERSION); al cambiar los estilos se descarta el subdirectorio viejo.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.fingerprint = self._style_fingerprint()
+        namespace = self.fingerprint[:16]
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name != namespace:
+                    shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        super().__init__(os.path.join(directory, namespace), max_bytes)
+        self.stats = Counter()
+
+    @staticmethod
+    def _style_fingerprint() -> str:
+        digest = hashlib.sha256(RENDER_VERSION.encode('utf-8'))
+        digest.update(json.dumps(PDF_CONFIG, sort_keys=True).encode('utf-8'))
+        logo_path = PDF_CONFIG["branding"]["logo_path"]
+        if os.path.exists(logo_path):
+            with open(logo_path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def key(self, article: Dict, cover: bool = False) -> str:
+        digest = hashlib.sha256(self.fingerprint.encode('utf-8'))
+        for value in ('portada' if cover else '', article['title'], article['date'], article['content']):
+            digest.update(value.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def count(self, event: str):
+        self.stats[event] += 1
+        metrics.inc(f'render_cache_{event}_total')
+
+    def store(self, key: str, path: str, future):
+        pages = future.result()
+        metrics.inc('pdf_pages_rendered_total', pages)
+        with open(path, 'rb') as f:
+            self.put(key, f.read(), {'pages': pages})
+
+    def log_stats(self):
+        logger.info(
+            f"Caché de renderizado: {self.stats['hit']} artículos reutilizados, "
+            f"{self.stats['render']} renderizados"
+        )
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def _append_content(page, stream_ref):
+    from pypdf.generic import ArrayObject, NameObject
+
+    contents = page[NameObject("/Contents")]
+    if isinstance(contents.get_object(), ArrayObject):
+        page[NameObject("/Contents")] = ArrayObject([*contents.get_object(), stream_ref])
+    else:
+        page[NameObject("/Contents")] = ArrayObject([contents, stream_ref])
+
+def _render_pdf_chunk(articles: List[Dict], filename: str, cover: bool) -> int:
+    generator = PDFGenerator(articles, filename)
+    return generator._build(filename, articles, cover=cover, page_numbers=False)
+
 class PDFGenerator:
-    def __init__(self, articles: List[Dict], filename: str):
+    # Artículos por bloque en el modo paralelo
+    CHUNK_SIZE = 50
+
+    def __init__(self, articles: Iterable[Dict], filename: str, workers: int = 1, chunk_size: int = None,
+                 render_cache: 'RenderCache' = None):
         self.articles = articles
         self.filename = filename
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.render_cache = render_cache
         self.styles = self._create_styles()
         self.logo = self._get_logo()
 
@@ -65,6 +193,10 @@ class PDFGenerator:
             )
         }
     def _header_footer(self, canvas, doc):
+        self._header(canvas, doc)
+        self._draw_footer(canvas, doc.page)
+
+    def _header(self, canvas, doc):
         canvas.saveState()
         # Encabezado verde
         canvas.setFillColor(colors.HexColor(PDF_CONFIG["colors"]["primary"]))
@@ -72,54 +204,169 @@ class PDFGenerator:
         
         if self.logo:
             self.logo.drawOn(canvas, 35*mm, A4[1] - 35*mm)
-        # Footer
+        canvas.restoreState()
+
+    def _draw_footer(self, canvas, page_number):
+        canvas.saveState()
         canvas.setFont(PDF_CONFIG["fonts"]["body"], PDF_CONFIG["fonts"]["sizes"]["meta"])
         canvas.setFillColor(colors.HexColor(PDF_CONFIG["colors"]["secondary"]))
-        footer_text = f"{PDF_CONFIG['branding']['website']} - Página {doc.page}"
+        footer_text = f"{PDF_CONFIG['branding']['website']} - Página {page_number}"
         canvas.drawCentredString(A4[0]/2, 15*mm, footer_text)
         canvas.restoreState()
 
+    @metrics.timed('pdf_generate_seconds')
     def generate(self):
         try:
-            doc = SimpleDocTemplate(
-                self.filename,
-                pagesize=A4,
-                leftMargin=PDF_CONFIG["page"]["margin"]["left"] * mm,
-                rightMargin=PDF_CONFIG["page"]["margin"]["right"] * mm,
-                topMargin=PDF_CONFIG["page"]["margin"]["top"] * mm,
-                bottomMargin=PDF_CONFIG["page"]["margin"]["bottom"] * mm
-            )
-            
-            elements = [
-                Spacer(1, 20),
-                Paragraph("Blog Cultivo Loco", self.styles['h1']),
-                Table(
-                    [[""]],
-                    colWidths=["100%"],
-                    style=[
-                        ('LINEBELOW', (0,0), (-1,-1), 1, colors.HexColor(PDF_CONFIG["colors"]["border"]))
-                    ]
-                ),
-                Spacer(1, PDF_CONFIG["spacing"]["section"])
-            ]
-            
-            for article in self.articles:
-                elements += [
-                    Paragraph(article["title"], self.styles['h2']),
-                    Paragraph(f"Publicado el {article['date']}", self.styles['meta']),
-                    Spacer(1, 8),
-                    Paragraph(article["content"], self.styles['body']),
-                    self._create_divider(),
-                    PageBreak()
-                ]
-            
-            doc.build(elements, onFirstPage=self._header_footer, onLaterPages=self._header_footer)
+            if self.render_cache:
+                self._generate_cached()
+            elif self.workers > 1:
+                self._generate_parallel()
+            else:
+                metrics.inc('pdf_pages_rendered_total', self._build(self.filename, self.articles))
             logging.info(f"PDF generado: {self.filename}")
         
         except Exception as e:
             logging.error(f"Error generando PDF: {str(e)}")
             raise
 
+    def _build(self, filename, articles, cover=True, page_numbers=True):
+        """Renderiza los artículos en `filename` y devuelve la cantidad de páginas."""
+        doc = SimpleDocTemplate(
+            filename,
+            pagesize=A4,
+            leftMargin=PDF_CONFIG["page"]["margin"]["left"] * mm,
+            rightMargin=PDF_CONFIG["page"]["margin"]["right"] * mm,
+            topMargin=PDF_CONFIG["page"]["margin"]["top"] * mm,
+            bottomMargin=PDF_CONFIG["page"]["margin"]["bottom"] * mm
+        )
+        
+        # Los artículos se convierten en flowables a medida que ReportLab los consume
+        elements = _FlowableStream(chain(
+            [self._cover_flowables()] if cover else [],
+            (self._article_flowables(article) for article in articles)
+        ))
+        
+        on_page = self._header_footer if page_numbers else self._header
+        with metrics.timer('pdf_build_seconds'):
+            doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+        return doc.page
+
+    def _generate_parallel(self):
+        # Cada proceso renderiza un bloque de capítulos sin número de página; al
+        # unir los bloques se estampan los pies para que la numeración sea continua
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(self.filename))) as tmp:
+            parts = []
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending = deque()
+                for index, chunk in enumerate(_chunked(self.articles, self.chunk_size)):
+                    path = os.path.join(tmp, f"parte-{index:05d}.pdf")
+                    pending.append(executor.submit(_render_pdf_chunk, chunk, path, index == 0))
+                    parts.append(path)
+                    # Pocos bloques en vuelo para que la memoria no crezca con el archivo
+                    while len(pending) > self.workers * 2:
+                        metrics.inc('pdf_pages_rendered_total', pending.popleft().result())
+                for future in pending:
+                    metrics.inc('pdf_pages_rendered_total', future.result())
+            
+            self._merge_parts(parts)
+
+    def _generate_cached(self):
+        # Cada artículo es un fragmento independiente (todos empiezan en página
+        # nueva); solo se renderizan los que no están en la caché
+        cache = self.render_cache
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(self.filename))) as tmp:
+            parts = []
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for index, article in enumerate(self.articles):
+                    key = cache.key(article, cover=index == 0)
+                    path = os.path.join(tmp, f"articulo-{index:06d}.pdf")
+                    parts.append(path)
+                    if cached := cache.get(key):
+                        cache.count('hit')
+                        with open(path, 'wb') as f:
+                            f.write(cached[0])
+                        continue
+                    
+                    cache.count('render')
+                    pending.append((key, path, executor.submit(_render_pdf_chunk, [article], path, index == 0)))
+                    while len(pending) > self.workers * 2:
+                        cache.store(*pending.popleft())
+                while pending:
+                    cache.store(*pending.popleft())
+            
+            self._merge_parts(parts)
+        cache.log_stats()
+
+    @metrics.timed('pdf_merge_seconds')
+    def _merge_parts(self, parts):
+        from pypdf import PdfWriter
+        from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+        
+        writer = PdfWriter()
+        for path in parts:
+            writer.append(path)
+        
+        # El pie se agrega como un stream de contenido extra por página: es mucho
+        # más barato que superponer páginas con merge_page
+        font = writer._add_object(DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject(f"/{PDF_CONFIG['fonts']['body']}"),
+            NameObject("/Encoding"): NameObject("/WinAnsiEncoding")
+        }))
+        for page_number, page in enumerate(writer.pages, 1):
+            resources = page[NameObject("/Resources")].get_object()
+            fonts = resources.setdefault(NameObject("/Font"), DictionaryObject()).get_object()
+            fonts[NameObject("/FPie")] = font
+            footer = DecodedStreamObject()
+            footer.set_data(self._footer_stream(page_number))
+            _append_content(page, writer._add_object(footer))
+        with open(self.filename, 'wb') as f:
+            writer.write(f)
+
+    def _footer_stream(self, page_number):
+        # Equivalente en operadores PDF de _draw_footer (fuentes estándar de PDF)
+        font = PDF_CONFIG["fonts"]["body"]
+        size = PDF_CONFIG["fonts"]["sizes"]["meta"]
+        text = f"{PDF_CONFIG['branding']['website']} - Página {page_number}"
+        x = A4[0] / 2 - stringWidth(text, font, size) / 2
+        red, green, blue = colors.HexColor(PDF_CONFIG["colors"]["secondary"]).rgb()
+        escaped = text.encode('cp1252').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+        return (
+            f"q BT /FPie {size} Tf {red:.6f} {green:.6f} {blue:.6f} rg "
+            f"1 0 0 1 {x:.4f} {15*mm:.4f} Tm ("
+        ).encode('ascii') + escaped + b") Tj ET Q"
+
+    def _cover_flowables(self):
+        return [
+            Spacer(1, 20),
+            Paragraph("Blog Cultivo Loco", self.styles['h1']),
+            Table(
+                [[""]],
+                colWidths=["100%"],
+                style=[
+                    ('LINEBELOW', (0,0), (-1,-1), 1, colors.HexColor(PDF_CONFIG["colors"]["border"]))
+                ]
+            ),
+            Spacer(1, PDF_CONFIG["spacing"]["section"])
+        ]
+
+    def _article_flowables(self, article):
+        # Un Paragraph por párrafo: partir un bloque enorme es lo más caro para ReportLab
+        paragraphs = [
+            Paragraph(text, self.styles['body'])
+            for text in article["content"].split("\n") if text.strip()
+        ] or [Paragraph(article["content"], self.styles['body'])]
+        return [
+            Paragraph(article["title"], self.styles['h2']),
+            Paragraph(f"Publicado el {article['date']}", self.styles['meta']),
+            Spacer(1, 8),
+            *paragraphs,
+            self._create_divider(),
+            PageBreak()
+        ]
+
     def _create_divider(self):
         return Table(
             [[""]],
@@ -130,33 +377,73 @@ class PDFGenerator:
         )
 
 class DOCXGenerator:
-    def __init__(self, articles: List[Dict], filename: str):
+    def __init__(self, articles: Iterable[Dict], filename: str, streaming: bool = False):
         self.articles = articles
         self.filename = filename
+        self.streaming = streaming
     
+    @metrics.timed('docx_generate_seconds')
     def generate(self):
         try:
-            doc = Document()
-            self._setup_styles(doc)
-            
-            # Portada
-            doc.add_heading('Catálogo de Artículos', 0)
-            doc.add_paragraph().add_run('Edición Especial').italic = True
-            
-            # Contenido
-            for article in self.articles:
-                doc.add_heading(article['title'], level=1)
-                doc.add_paragraph(f"Publicado el {article['date']}", style='Intense Quote')
-                doc.add_paragraph(article['content'])
-                doc.add_page_break()
-            
-            doc.save(self.filename)
+            if self.streaming:
+                self._generate_streaming()
+            else:
+                doc = self._create_document()
+                
+                # Contenido
+                for article in self.articles:
+                    doc.add_heading(article['title'], level=1)
+                    doc.add_paragraph(f"Publicado el {article['date']}", style='Intense Quote')
+                    doc.add_paragraph(article['content'])
+                    doc.add_page_break()
+                    metrics.inc('docx_articles_written_total')
+                
+                with metrics.timer('docx_save_seconds'):
+                    doc.save(self.filename)
             logger.info(f"DOCX generado: {self.filename}")
         
         except Exception as e:
             logger.error(f"Error generando DOCX: {str(e)}")
             raise
     
+    def _create_document(self):
+        doc = Document()
+        self._setup_styles(doc)
+        
+        # Portada
+        doc.add_heading('Catálogo de Artículos', 0)
+        doc.add_paragraph().add_run('Edición Especial').italic = True
+        return doc
+    
+    def _generate_streaming(self):
+        # La plantilla (estilos y portada) la arma python-docx; los artículos se
+        # escriben directo como XML dentro de word/document.xml, uno por vez
+        doc = self._create_document()
+        heading_id = doc.styles['Heading 1'].style_id
+        date_id = doc.styles['Intense Quote'].style_id
+        template = io.BytesIO()
+        doc.save(template)
+        
+        with zipfile.ZipFile(template) as source, \
+                zipfile.ZipFile(self.filename, 'w', zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                if item.filename != 'word/document.xml':
+                    target.writestr(item, source.read(item.filename))
+            
+            document_xml = source.read('word/document.xml')
+            body_end = document_xml.rindex(b'<w:sectPr')
+            with target.open('word/document.xml', 'w') as out:
+                out.write(document_xml[:body_end])
+                for article in self.articles:
+                    out.write(''.join((
+                        _docx_paragraph(article['title'], heading_id),
+                        _docx_paragraph(f"Publicado el {article['date']}", date_id),
+                        _docx_paragraph(article['content']),
+                        _DOCX_PAGE_BREAK
+                    )).encode('utf-8'))
+                    metrics.inc('docx_articles_written_total')
+                out.write(document_xml[body_end:])
+    
     def _setup_styles(self, doc):
         cfg = PDF_CONFIG
         styles = doc.styles
@@ -174,7 +461,7 @@ class DOCXGenerator:
         heading_style.font.color.rgb = RGBColor.from_string(cfg["colors"]["primary"][1:])
         
         # Fecha
-        date_style = styles.add_style('CultivoDate', 4)
+        date_style = styles.add_style('CultivoDate', WD_STYLE_TYPE.PARAGRAPH)
         date_style.font.name = 'Calibri'
         date_style.font.italic = True
         date_style.font.size = Pt(cfg["fonts"]["sizes"]["meta"])
@@ -208,4 +495,101 @@ class DOCXGenerator:
         content.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
         
         # Divisor
-        doc.add_paragraph().add_run("―" * 50).color.rgb = RGBColor.from_string(PDF_CONFIG["colors"]["border"][1:])
\ No newline at end of file
+        doc.add_paragraph().add_run("―" * 50).color.rgb = RGBColor.from_string(PDF_CONFIG["colors"]["border"][1:])
+def create_generator(fmt: str, articles: Iterable[Dict], output: str, workers: int = 1,
+                     incremental: bool = False, streaming: bool = False):
+    """Generador de `fmt` que escribe `{output}.{fmt}`; cada opción aplica solo a su formato."""
+    if fmt == 'pdf':
+        render_cache = None
+        if incremental:
+            render_cache = RenderCache(RENDER_CACHE["directory"], RENDER_CACHE["max_size_mb"] * 1024 * 1024)
+        return PDFGenerator(articles, f"{output}.pdf", workers=workers, render_cache=render_cache)
+    if fmt == 'docx':
+        return DOCXGenerator(articles, f"{output}.docx", streaming=streaming)
+    raise ValueError(f"Formato desconocido: {fmt}")
+
+def _iter_queue(queue) -> Iterator[Dict]:
+    while (chunk := queue.get()) is not None:
+        yield from chunk
+
+def _generate_from_queue(fmt, queue, results, output, options):
+    # Con fork el proceso hereda las métricas del padre; solo se devuelven las propias
+    metrics.reset()
+    try:
+        create_generator(fmt, _iter_queue(queue), output, **options).generate()
+        results.put((fmt, None, metrics.snapshot()))
+    except BaseException as e:
+        results.put((fmt, f"{type(e).__name__}: {e}", metrics.snapshot()))
+
+def _feed(queue, process, chunk) -> bool:
+    # Si el proceso murió nadie va a vaciar su cola: se deja de alimentar
+    while True:
+        try:
+            queue.put(chunk, timeout=1)
+            return True
+        except Full:
+            if not process.is_alive():
+                return False
+
+def generate_formats(articles: Iterable[Dict], formats: List[str], output: str,
+                     chunk_size: int = 50, queue_chunks: int = 4, **options) -> List[str]:
+    """Genera varios formatos a la vez leyendo `articles` una sola vez.
+
+    Cada formato corre en su propio proceso y recibe los artículos en bloques de
+    `chunk_size` por una cola de `queue_chunks` bloques: el formato más lento marca
+    el ritmo de la lectura y la memoria no crece con el libro. Si algún formato
+    falla, los demás terminan igual y al final se lanza RuntimeError.
+    """
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    workers = {}
+    for fmt in formats:
+        queue = context.Queue(maxsize=queue_chunks)
+        process = context.Process(target=_generate_from_queue, name=f"generate-{fmt}",
+                                  args=(fmt, queue, results, output, options))
+        process.start()
+        workers[fmt] = (queue, process)
+    
+    try:
+        active = dict(workers)
+        for chunk in _chunked(articles, chunk_size):
+            with metrics.timer('generate_fanout_wait_seconds'):
+                for fmt, (queue, process) in list(active.items()):
+                    if not _feed(queue, process, chunk):
+                        queue.cancel_join_thread()
+                        del active[fmt]
+        for queue, process in active.values():
+            _feed(queue, process, None)
+        
+        errors = {}
+        pending = set(workers)
+        silent = set()
+        while pending:
+            try:
+                fmt, error, snapshot = results.get(timeout=1)
+            except Empty:
+                # Un proceso que murió sin reportar (por ejemplo, sin memoria) no va a
+                # responder; se espera una vuelta más por si el resultado llegó justo tarde
+                for fmt in [fmt for fmt in pending if not workers[fmt][1].is_alive()]:
+                    if fmt in silent:
+                        errors[fmt] = f"el proceso terminó con código {workers[fmt][1].exitcode}"
+                        pending.discard(fmt)
+                    silent.add(fmt)
+                continue
+            metrics.merge(snapshot)
+            pending.discard(fmt)
+            if error:
+                errors[fmt] = error
+        for _, process in workers.values():
+            process.join()
+    finally:
+        for queue, process in workers.values():
+            if process.is_alive():
+                queue.cancel_join_thread()
+                process.terminate()
+    
+    for fmt, error in errors.items():
+        logger.error(f"Error generando {fmt.upper()}: {error}")
+    if errors:
+        raise RuntimeError(f"Fallaron los formatos: {', '.join(errors)}")
+    return list(workers)
@@ -1,9 +1,55 @@
 import argparse
+import json
 import logging
+import os
+import sqlite3
 import sys
-from database import DatabaseManager
-from scraper import BlogScraper
-from generators import PDFGenerator, DOCXGenerator
+from datetime import date
+from config import DB_CONFIG, OUTPUT_FORMATS, SITES_DIR
+from metrics import registry as metrics
+
+# Los módulos de cada comando (SQLAlchemy, requests/bs4, ReportLab/python-docx) se
+# importan dentro de main(): cargarlos todos tardaba más que muchos comandos en sí
+
+def read_stats(db_path):
+    """Cantidad de artículos, rango de fechas y artículos por sitio, con sqlite3 en solo lectura."""
+    with sqlite3.connect(f"file:{db_path}?mode=ro", uri=True) as conn:
+        total, first, last, updated = conn.execute(
+            "SELECT count(*), min(publish_date), max(publish_date), max(updated_at) FROM articles"
+        ).fetchone()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        sites = {}
+        if 'site' in columns:
+            sites = dict(conn.execute("SELECT site, count(*) FROM articles GROUP BY site ORDER BY 2 DESC"))
+    return {
+        "articles": total,
+        "date_from": first[:10] if first else None,
+        "date_to": last[:10] if last else None,
+        "last_update": updated[:19] if updated else None,
+        "sites": sites,
+        "size_mb": round(os.path.getsize(db_path) / (1024 * 1024), 2)
+    }
+
+def database_size(db_path):
+    """Bytes de la base, contando las páginas que todavía están en el WAL."""
+    wal = f"{db_path}-wal"
+    return os.path.getsize(db_path) + (os.path.getsize(wal) if os.path.exists(wal) else 0)
+
+def search_query(args):
+    """Consulta FTS5 de search/--query: las palabras se buscan como texto, salvo con --raw."""
+    if args.query is None or args.raw:
+        return args.query
+    from database import fts_query
+    return fts_query(args.query)
+
+def parse_formats(value):
+    """Lista de formatos de --format ("pdf", "pdf,docx"), sin repetidos."""
+    formats = list(dict.fromkeys(fmt.strip().lower() for fmt in value.split(',') if fmt.strip()))
+    if not formats or (unknown := [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]):
+        raise argparse.ArgumentTypeError(
+            f"formato no válido: {value} (opciones: {', '.join(OUTPUT_FORMATS)}, separadas por comas)"
+        )
+    return formats
 
 def main():
     parser = argparse.ArgumentParser(description="📚 Gestor de Contenido - CultivoLoco")
@@ -12,14 +58,50 @@ def main():
     # Comando para scraping
     scrape_parser = subparsers.add_parser('scrape', help='Extraer artículos del blog')
     scrape_parser.add_argument("--max-articles", type=int, help="Límite máximo de artículos a extraer")
+    scrape_parser.add_argument("--concurrency", type=int, default=1, help="Número de descargas simultáneas (por sitio)")
+    scrape_parser.add_argument("--incremental", action="store_true", help="Detenerse en la primera página sin artículos nuevos")
+    scrape_parser.add_argument("--refresh", action="store_true", help="Volver a descargar artículos ya guardados y actualizar los modificados")
+    scrape_parser.add_argument("--sites", help="Sitios a rastrear en paralelo, separados por comas (perfiles en sites/), o 'all'")
+    scrape_parser.add_argument("--discovery", choices=["listing", "sitemap"], help="Descubrir artículos paginando el listado (por defecto) o leyendo el sitemap (solo nuevos o modificados)")
+    scrape_parser.add_argument("--resume", action="store_true", help="Continuar el último rastreo desde donde se detuvo")
+    scrape_parser.add_argument("--no-cache", action="store_true", help="Desactivar la caché HTTP en disco")
+    scrape_parser.add_argument("--profile", nargs="?", const="perfil.json", metavar="ARCHIVO", help="Mostrar tiempos por etapa y guardarlos en ARCHIVO (.json o .prom)")
     scrape_parser.add_argument("--loglevel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     
     # Comando para generación
     generate_parser = subparsers.add_parser('generate', help='Generar archivo de salida')
-    generate_parser.add_argument("-f", "--format", choices=["pdf", "docx"], required=True)
+    generate_parser.add_argument("-f", "--format", type=parse_formats, required=True, help=f"Formato de salida ({', '.join(OUTPUT_FORMATS)}); con varios separados por comas se generan a la vez leyendo la base una sola vez")
     generate_parser.add_argument("-o", "--output", required=True)
+    generate_parser.add_argument("--workers", type=int, default=1, help="Procesos para renderizar el PDF en paralelo")
+    generate_parser.add_argument("--incremental", action="store_true", help="Reutilizar los artículos ya renderizados (solo PDF)")
+    generate_parser.add_argument("--streaming", action="store_true", help="Escribir el DOCX a medida que se leen los artículos (memoria constante)")
+    generate_parser.add_argument("--date-from", type=date.fromisoformat, help="Incluir artículos publicados desde esta fecha (AAAA-MM-DD)")
+    generate_parser.add_argument("--date-to", type=date.fromisoformat, help="Incluir artículos publicados hasta esta fecha (AAAA-MM-DD)")
+    generate_parser.add_argument("--id-from", type=int, help="Id mínimo de artículo")
+    generate_parser.add_argument("--id-to", type=int, help="Id máximo de artículo")
+    generate_parser.add_argument("--site", help="Incluir solo los artículos de este sitio")
+    generate_parser.add_argument("--query", help="Incluir solo los artículos que contienen todas estas palabras (prefijo*)")
+    generate_parser.add_argument("--raw", action="store_true", help="Pasar --query tal cual, con la sintaxis de FTS5")
+    generate_parser.add_argument("--profile", nargs="?", const="perfil.json", metavar="ARCHIVO", help="Mostrar tiempos por etapa y guardarlos en ARCHIVO (.json o .prom)")
     generate_parser.add_argument("--loglevel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     
+    # Comando para búsqueda
+    search_parser = subparsers.add_parser('search', help='Buscar artículos por texto')
+    search_parser.add_argument("query", help="Palabras a buscar; deben aparecer todas (prefijo* para buscar por el comienzo)")
+    search_parser.add_argument("--raw", action="store_true", help="Usar la sintaxis de FTS5: frases entre comillas, AND, OR, NOT, NEAR")
+    search_parser.add_argument("--limit", type=int, default=20, help="Cantidad máxima de resultados")
+    search_parser.add_argument("--loglevel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    
+    # Comando de estado (rápido: no carga SQLAlchemy ni migra la base)
+    stats_parser = subparsers.add_parser('stats', help='Mostrar cantidad de artículos y rango de fechas')
+    stats_parser.add_argument("--json", action="store_true", help="Salida en JSON (para scripts y health checks)")
+    stats_parser.add_argument("--loglevel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    
+    # Comando para comprimir (o descomprimir) el contenido ya guardado
+    compress_parser = subparsers.add_parser('compress-db', help='Comprimir el contenido guardado y compactar la base')
+    compress_parser.add_argument("--codec", choices=["auto", "zlib", "zstd", "none"], help="Códec (por defecto DB_CONFIG['compression'], o auto si está desactivada); none descomprime")
+    compress_parser.add_argument("--loglevel", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    
     args = parser.parse_args()
     
     logging.basicConfig(
@@ -28,39 +110,136 @@ def main():
     )
     logger = logging.getLogger(__name__)
     
+    if args.command == 'stats':
+        if not os.path.exists(DB_CONFIG["path"]):
+            logger.error(f"❌ No existe la base de datos {DB_CONFIG['path']}")
+            sys.exit(1)
+        try:
+            stats = read_stats(DB_CONFIG["path"])
+        except sqlite3.Error as e:
+            logger.error(f"❌ No se pudo leer la base de datos {DB_CONFIG['path']}: {e}")
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(stats, ensure_ascii=False))
+        else:
+            print(f"📚 Artículos: {stats['articles']}")
+            print(f"📅 Fechas: {stats['date_from'] or '-'} → {stats['date_to'] or '-'}")
+            print(f"🕒 Última actualización: {stats['last_update'] or '-'}")
+            for site, count in stats['sites'].items():
+                print(f"🌐 {site}: {count}")
+            print(f"💾 Tamaño: {stats['size_mb']} MB")
+        return
+    
+    from sqlalchemy.exc import OperationalError
+    from database import DatabaseManager
     db = DatabaseManager()
     
     try:
-        if args.command == 'scrape':
-            scraper = BlogScraper(db)
-            logger.info("🔍 Buscando artículos...")
-            urls = scraper.get_all_article_links(args.max_articles)
-            logger.info(f"✅ Encontrados {len(urls)} URLs")
-            
-            logger.info("⚙️ Procesando contenido...")
-            articles = scraper.extract_articles(urls)
-            logger.info(f"📚 Artículos nuevos guardados: {len(articles)}")
+        if args.command == 'scrape' and args.sites:
+            from scraper import crawl_sites
+            from sites import load_profiles
+
+            profiles = load_profiles(args.sites.split(','))
+            if not profiles:
+                logger.error(f"❌ No hay perfiles de sitio en {SITES_DIR}/ (cree uno como {SITES_DIR}/<nombre>.json)")
+                sys.exit(1)
+            logger.info(f"🌐 Rastreando {len(profiles)} sitios: {', '.join(p['name'] for p in profiles)}")
+            saved = crawl_sites(db, profiles, concurrency=args.concurrency, use_cache=not args.no_cache,
+                                discovery=args.discovery, max_articles=args.max_articles,
+                                incremental=args.incremental, refresh=args.refresh, resume=args.resume)
+            for profile in profiles:
+                logger.info(f"📚 {profile['name']}: {saved[profile['name']]} artículos nuevos o actualizados")
+        
+        elif args.command == 'scrape':
+            from scraper import BlogScraper
+            scraper = BlogScraper(db, concurrency=args.concurrency, use_cache=not args.no_cache)
+            logger.info("🔍 Buscando y procesando artículos...")
+            articles = scraper.crawl(args.max_articles, incremental=args.incremental, refresh=args.refresh,
+                                     resume=args.resume, discovery=args.discovery or "listing")
+            scraper.log_stats()
+            logger.info(f"📚 Artículos nuevos o actualizados guardados: {len(articles)}")
         
         elif args.command == 'generate':
-            logger.info("📖 Cargando artículos desde la base de datos...")
-            articles = db.get_all_articles()
+            logger.info("📖 Leyendo artículos desde la base de datos...")
+            filters = {
+                "date_from": args.date_from,
+                "date_to": args.date_to,
+                "id_from": args.id_from,
+                "id_to": args.id_to,
+                "query": search_query(args),
+                "site": args.site
+            }
+            try:
+                total = db.count_articles(**filters)
+            except OperationalError as e:
+                logger.error(f"❌ Búsqueda no válida: {args.query} ({e.orig})")
+                sys.exit(1)
             
-            if not articles:
-                logger.error("❌ No hay artículos en la base de datos")
+            if not total:
+                if any(value is not None for value in filters.values()):
+                    logger.error("❌ Ningún artículo coincide con los filtros")
+                else:
+                    logger.error("❌ No hay artículos en la base de datos")
                 sys.exit(1)
-                
-            logger.info(f"🖨️ Generando {args.format.upper()} con {len(articles)} artículos...")
             
-            if args.format == 'pdf':
-                generator = PDFGenerator(articles, f"{args.output}.pdf")
+            articles = db.iter_articles(**filters)
+            names = ', '.join(fmt.upper() for fmt in args.format)
+            logger.info(f"🖨️ Generando {names} con {total} artículos...")
+            options = {"workers": args.workers, "incremental": args.incremental, "streaming": args.streaming}
+            
+            if len(args.format) == 1:
+                from generators import create_generator
+                create_generator(args.format[0], articles, args.output, **options).generate()
             else:
-                generator = DOCXGenerator(articles, f"{args.output}.docx")
+                from generators import generate_formats
+                generate_formats(articles, args.format, args.output, **options)
             
-            generator.generate()
-            logger.info(f"🎉 ¡Archivo generado! → {args.output}.{args.format}")
+            for fmt in args.format:
+                logger.info(f"🎉 ¡Archivo generado! → {args.output}.{fmt}")
+        
+        elif args.command == 'search':
+            try:
+                results = db.search(search_query(args), args.limit)
+            except OperationalError as e:
+                logger.error(f"❌ Búsqueda no válida: {args.query} ({e.orig})")
+                sys.exit(1)
+            if not results:
+                logger.info(f"🔎 Sin resultados para: {args.query}")
+            for position, result in enumerate(results, 1):
+                print(f"{position:>3}. [{result['id']}] {result['title']} ({result['date']})")
+                print(f"     {result['url']}")
+                print(f"     {result['snippet']}")
+        
+        elif args.command == 'compress-db':
+            from database import resolve_codec
+            
+            codec = resolve_codec(args.codec or DB_CONFIG["compression"] or 'auto')
+            size_before = database_size(DB_CONFIG["path"])
+            logger.info(f"🗜️ Reescribiendo el contenido con {codec or 'texto plano'}...")
+            rewritten, content_before, content_after = db.compress_content(codec, DB_CONFIG["compression_level"])
+            logger.info("🧹 Compactando la base (VACUUM)...")
+            db.vacuum()
+            size_after = database_size(DB_CONFIG["path"])
+            mb = 1024 * 1024
+            print(f"📝 Filas reescritas: {rewritten}")
+            print(f"📄 Contenido: {content_before / mb:.2f} MB → {content_after / mb:.2f} MB")
+            print(f"💾 Archivo: {size_before / mb:.2f} MB → {size_after / mb:.2f} MB "
+                  f"({(size_after - size_before) / max(size_before, 1):+.0%})")
+            if codec != resolve_codec():
+                logger.warning(
+                    f"⚠️ DB_CONFIG['compression'] es {DB_CONFIG['compression']!r}: los artículos nuevos "
+                    f"se guardarán con {resolve_codec() or 'texto plano'}"
+                )
+    
+        if getattr(args, 'profile', None):
+            print(metrics.summary())
+            metrics.write(args.profile)
+            logger.info(f"📊 Métricas guardadas en {args.profile}")
     
     except KeyboardInterrupt:
         logger.error("🚫 Operación cancelada por el usuario")
+        if args.command == 'scrape':
+            logger.info("💾 El progreso quedó guardado; use scrape --resume para continuar")
         sys.exit(130)
     except Exception as e:
         logger.error(f"💥 Error crítico: {str(e)}", exc_info=args.loglevel == "DEBUG")
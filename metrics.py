@@ -0,0 +1,164 @@
+import copy
+import functools
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+# Límites de los buckets de latencia, en segundos
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        # Aproximado: límite superior del bucket donde cae el cuantil
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    """Contadores e histogramas de latencia del proceso, seguros entre hilos."""
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        """Decorador que registra la duración de cada llamada en el histograma `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def timed_iter(self, name: str, items: Iterable) -> Iterator:
+        """Mide cuánto tarda en llegar cada elemento, sin contar el trabajo del consumidor."""
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(name, time.perf_counter() - start)
+            yield item
+
+    def snapshot(self):
+        """Copia de contadores e histogramas que se puede enviar a otro proceso y sumar con merge()."""
+        with self._lock:
+            return dict(self.counters), copy.deepcopy(self.histograms)
+
+    def merge(self, snapshot):
+        counters, histograms = snapshot
+        with self._lock:
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, other in histograms.items():
+                histogram = self.histograms.setdefault(name, Histogram(other.buckets))
+                histogram.count += other.count
+                histogram.sum += other.sum
+                histogram.max = max(histogram.max, other.max)
+                histogram.counts = [a + b for a, b in zip(histogram.counts, other.counts)]
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def summary(self) -> str:
+        lines = [f"{'métrica':<34} {'n':>8} {'total s':>10} {'media ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'máx ms':>10}"]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                lines.append(
+                    f"{name:<34} {h.count:>8} {h.sum:>10.3f} {h.sum / h.count * 1000:>10.2f} "
+                    f"{h.quantile(0.5) * 1000:>10.2f} {h.quantile(0.95) * 1000:>10.2f} {h.max * 1000:>10.2f}"
+                )
+            if self.counters:
+                lines.append("")
+                lines.extend(f"{name:<34} {value:>12g}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: {
+                        "count": h.count,
+                        "sum": h.sum,
+                        "max": h.max,
+                        "p50": h.quantile(0.5),
+                        "p95": h.quantile(0.95),
+                        "buckets": {str(bound): count for bound, count in zip(h.buckets, h.counts)}
+                    } for name, h in self.histograms.items()
+                }
+            }
+
+    def to_prometheus(self, prefix: str = "blog_to_book_") -> str:
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines += [f"# TYPE {prefix}{name} counter", f"{prefix}{name} {value:g}"]
+            for name, h in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else f"{bound:g}"
+                    lines.append(f'{prefix}{name}_bucket{{le="{le}"}} {cumulative}')
+                lines += [f"{prefix}{name}_sum {h.sum:g}", f"{prefix}{name}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Escribe las métricas en formato textfile de Prometheus (.prom) o JSON (resto)."""
+        data = self.to_prometheus() if path.endswith('.prom') else json.dumps(self.to_dict(), indent=2)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+
+
+registry = Registry()
@@ -0,0 +1,139 @@
+import codecs
+import logging
+import re
+from typing import Any, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
+from config import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Documento devuelto por parse_html: BeautifulSoup o LexborDocument, ambos con
+# select/select_one y elementos con .text, .get(), [attr] y find_all()
+Document = Any
+
+# Primer selector simple de una regla: etiqueta, clases y atributos requeridos
+_COMPOUND = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)((?:\[[\w-]+\])*)$')
+
+
+class LexborElement:
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    def get(self, attr: str, default=None):
+        return self._node.attributes.get(attr, default)
+
+    def __getitem__(self, attr: str):
+        return self._node.attributes[attr]
+
+    def find_all(self, tag: str) -> List['LexborElement']:
+        return [LexborElement(node) for node in self._node.css(tag)]
+
+    def select(self, selector: str) -> List['LexborElement']:
+        return self.find_all(selector)
+
+
+class LexborDocument:
+    """Adaptador mínimo de selectolax con la interfaz de BeautifulSoup que usa el scraper."""
+
+    def __init__(self, tree):
+        self._tree = tree
+
+    def select(self, selector: str) -> List[LexborElement]:
+        return [LexborElement(node) for node in self._tree.css(selector)]
+
+    def select_one(self, selector: str) -> Optional[LexborElement]:
+        node = self._tree.css_first(selector)
+        return LexborElement(node) if node is not None else None
+
+
+def resolve_backend(name: str = None) -> str:
+    name = name or HTML_PARSER
+    if name == "auto":
+        if LexborHTMLParser is not None:
+            return "selectolax"
+        return "lxml" if HAS_LXML else "html.parser"
+    if name == "selectolax" and LexborHTMLParser is None:
+        logger.warning("selectolax no está instalado, se usa html.parser")
+        return "html.parser"
+    if name == "lxml" and not HAS_LXML:
+        logger.warning("lxml no está instalado, se usa html.parser")
+        return "html.parser"
+    return name
+
+
+def build_scope(selectors: List[str]) -> Optional[SoupStrainer]:
+    """Arma un SoupStrainer que conserva solo los subárboles donde pueden coincidir los selectores.
+
+    Se filtra por el primer selector simple de cada regla (etiqueta, clases y
+    atributos), así los descendientes quedan disponibles para el resto de la
+    regla. Si alguna regla no se puede acotar se devuelve None (página entera).
+    """
+    matchers = []
+    for selector in selectors:
+        match = _COMPOUND.match(selector.split()[0])
+        if not match or not any(match.groups()):
+            return None
+        tag, classes, attrs = match.groups()
+        matchers.append((
+            tag,
+            set(re.findall(r'\.([\w-]+)', classes)),
+            re.findall(r'\[([\w-]+)\]', attrs)
+        ))
+
+    def in_scope(name, attrs):
+        tag_classes = attrs.get('class') or ''
+        if isinstance(tag_classes, str):
+            tag_classes = tag_classes.split()
+        for tag, classes, required in matchers:
+            if tag and name != tag:
+                continue
+            if classes and not classes.issubset(tag_classes):
+                continue
+            if all(attr in attrs for attr in required):
+                return True
+        return False
+
+    return SoupStrainer(in_scope)
+
+
+def parse_html(body: bytes, encoding: Optional[str] = None,
+               scope: Optional[SoupStrainer] = None, backend: str = None) -> Document:
+    """Parsea bytes HTML con el backend más rápido disponible.
+
+    `scope` solo aplica a los backends de BeautifulSoup; selectolax siempre
+    construye el árbol completo, que de todos modos es más barato.
+    """
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return LexborDocument(LexborHTMLParser(_lexbor_input(body, encoding)))
+    return BeautifulSoup(body, backend, from_encoding=encoding, parse_only=scope)
+
+
+def _lexbor_input(body: bytes, encoding: Optional[str]):
+    # lexbor asume UTF-8 con bytes; cualquier otra codificación se decodifica antes
+    encoding = encoding or EncodingDetector.find_declared_encoding(body, is_html=True)
+    try:
+        if encoding and codecs.lookup(encoding).name != 'utf-8':
+            return body.decode(encoding, errors='replace')
+    except LookupError:
+        pass
+    return body
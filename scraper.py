@@ -1,123 +1,565 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin
 import logging
-import time
+import queue
 import random
-from typing import List, Dict, Optional
-from config import BASE_URL, SELECTORS, MAX_PAGES
-from database import DatabaseManager
-import dateparser
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
+from config import BASE_URL, DEFAULT_SITE, SELECTORS, MAX_PAGES, RATE_LIMIT, HTTP_CACHE, HTTP_RETRY, SITEMAP
+from cache import ResponseCache, declared_encoding
+from database import BatchWriter, DatabaseManager
+from dates import DateNormalizer
+from metrics import registry as metrics
+from parsers import Document, build_scope, parse_html, resolve_backend
+from sitemap import SitemapEntry, gunzip_chunks, iter_sitemap
+from throttle import THROTTLE_STATUSES, AdaptiveRateLimiter, HostRateLimiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+_END_OF_LINKS = object()
+
+DISCOVERY_MODES = ('listing', 'sitemap')
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Caché HTTP configurada en config.py, o None si está desactivada."""
+    if not HTTP_CACHE["enabled"]:
+        return None
+    return ResponseCache(HTTP_CACHE["directory"], HTTP_CACHE["max_size_mb"] * 1024 * 1024, HTTP_CACHE["max_age"])
+
 class BlogScraper:
-    def __init__(self, db: DatabaseManager):
+    def __init__(self, db: DatabaseManager, concurrency: int = 1, use_cache: bool = True,
+                 base_url: str = BASE_URL, max_pages: int = MAX_PAGES, rate_limit: Optional[Dict] = RATE_LIMIT,
+                 selectors: Dict = SELECTORS, site: str = DEFAULT_SITE, cache: Optional[ResponseCache] = None):
         self.db = db
+        self.concurrency = max(1, concurrency)
+        self.base_url = base_url
+        self.max_pages = max_pages
+        self.selectors = selectors
+        self.site = site
+        # Con varios sitios a la vez cada uno registra con su propio nombre (scraper.<sitio>)
+        self.logger = logger.getChild(site)
+        self.rate_limiter = self._build_rate_limiter(rate_limit)
+        # Una caché compartida (varios sitios) la crea y la reporta quien la pasa
+        self.cache = cache
+        self._owns_cache = cache is None
+        if cache is None and use_cache:
+            self.cache = build_response_cache()
+        self.dates = DateNormalizer()
+        # lastmod de los sitemaps para las URLs encoladas; se guarda junto con el artículo
+        self._lastmods: Dict[str, datetime] = {}
+        self.parser_backend = resolve_backend()
+        # Las páginas se parsean solo en los subárboles que usan los selectores
+        self.listing_scope = build_scope(selectors["article_links"] + selectors["next_page"])
+        self.article_scope = build_scope(selectors["title"] + selectors["content"] + selectors["date"])
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept-Language": "es-ES,es;q=0.9"
         })
+        # Una conexión reutilizable por hilo: los `concurrency` trabajadores más el que
+        # recorre el listado o los sitemaps. urllib3 reintenta solo los fallos de conexión;
+        # los timeouts de lectura se reintentan en _request para que pasen por el limitador
+        adapter = HTTPAdapter(pool_maxsize=self.concurrency + 1, max_retries=Retry(
+            total=None,
+            connect=HTTP_RETRY["attempts"] - 1,
+            read=False,
+            status=0,
+            other=0,
+            backoff_factor=HTTP_RETRY["backoff"],
+            backoff_max=HTTP_RETRY["backoff_max"],
+            backoff_jitter=HTTP_RETRY["backoff"],
+            raise_on_status=False
+        ))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
-    def _get_soup(self, url: str) -> Optional[BeautifulSoup]:
+    @classmethod
+    def for_site(cls, db: DatabaseManager, profile: Dict, **kwargs) -> 'BlogScraper':
+        """Crea un scraper a partir de un perfil de sites.load_profile."""
+        return cls(db, base_url=profile["base_url"], max_pages=profile["max_pages"],
+                   rate_limit=profile["rate_limit"], selectors=profile["selectors"], site=profile["name"], **kwargs)
+    
+    @staticmethod
+    def _build_rate_limiter(rate_limit: Optional[Dict]) -> HostRateLimiter:
+        # rate_limit=None desactiva el límite (servidores locales de prueba)
+        if not rate_limit:
+            return HostRateLimiter(None)
+        if rate_limit.get("adaptive"):
+            return AdaptiveRateLimiter(
+                rate_limit["requests_per_second"], rate_limit["burst"],
+                min_rate=rate_limit["min_rate"], max_rate=rate_limit["max_rate"],
+                increase=rate_limit["increase"], decrease=rate_limit["decrease"],
+                target_latency=rate_limit["target_latency"]
+            )
+        return HostRateLimiter(rate_limit["requests_per_second"], rate_limit["burst"])
+    
+    def _get_soup(self, url: str, scope: Optional[SoupStrainer] = None) -> Optional[Document]:
         try:
-            time.sleep(random.uniform(1, 3))
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            return self._load(url, scope)
         except Exception as e:
-            logger.error(f"Error en {url}: {type(e).__name__}")
+            self.logger.error(f"Error en {url}: {type(e).__name__}")
             return None
     
+    def _load(self, url: str, scope: Optional[SoupStrainer] = None) -> Document:
+        body, encoding = self._fetch(url)
+        with metrics.timer('scrape_parse_seconds'):
+            return parse_html(body, encoding, scope, self.parser_backend)
+    
+    def _request(self, url: str, headers: Optional[Dict] = None, stream: bool = False) -> requests.Response:
+        """GET con límite de tasa; los estados transitorios (429, 5xx) y los timeouts se reintentan con espera.
+        
+        Devuelve la última respuesta aunque siga siendo un error: quien llama decide.
+        Con `stream` el cuerpo de la respuesta devuelta queda sin leer.
+        """
+        attempts = HTTP_RETRY["attempts"]
+        for attempt in range(attempts):
+            try:
+                response = self._timed_get(url, headers=headers, stream=stream)
+            except requests.Timeout:
+                if attempt == attempts - 1:
+                    raise
+                metrics.inc('scrape_retries_total')
+                self.logger.warning(f"{url}: timeout, reintento {attempt + 1} de {attempts - 1}")
+                time.sleep(self._backoff(attempt))
+                continue
+            if not stream:
+                metrics.inc('scrape_bytes_downloaded_total', len(response.content))
+            if response.status_code not in HTTP_RETRY["statuses"] or attempt == attempts - 1:
+                return response
+            
+            response.close()
+            metrics.inc('scrape_retries_total')
+            retry_after = self._retry_after(response)
+            self.logger.warning(f"{url}: estado {response.status_code}, reintento {attempt + 1} de {attempts - 1}")
+            # Con Retry-After la pausa la aplica el limitador en el próximo wait
+            if not (retry_after and self.rate_limiter.rate):
+                time.sleep(retry_after or self._backoff(attempt))
+        return response
+    
+    def _timed_get(self, url: str, **kwargs) -> requests.Response:
+        # Cada respuesta (o timeout) alimenta al limitador adaptativo
+        with metrics.timer('scrape_throttle_wait_seconds'):
+            self.rate_limiter.wait(url)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=HTTP_RETRY["timeout"], **kwargs)
+        except requests.Timeout:
+            self.rate_limiter.record(url, None, time.perf_counter() - start)
+            raise
+        latency = time.perf_counter() - start
+        metrics.observe('scrape_fetch_seconds', latency)
+        metrics.inc('scrape_requests_total')
+        self.rate_limiter.record(url, response.status_code, latency, self._retry_after(response))
+        return response
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        if response.status_code in THROTTLE_STATUSES:
+            return parse_retry_after(response.headers.get('Retry-After'), HTTP_RETRY["backoff_max"])
+        return None
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Exponencial con jitter: entre la mitad y el total de la espera nominal
+        return min(HTTP_RETRY["backoff_max"], HTTP_RETRY["backoff"] * 2 ** attempt) * random.uniform(0.5, 1.0)
+    
+    def _fetch(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """Devuelve el cuerpo en bytes y la codificación declarada por el servidor, si la hay."""
+        if not self.cache:
+            response = self._request(url)
+            response.raise_for_status()
+            return response.content, declared_encoding(response)
+        
+        headers = {}
+        if cached := self.cache.get(url):
+            body, meta = cached
+            if self.cache.is_fresh(meta):
+                self.cache.count('hit')
+                return body, meta['encoding']
+            headers = self.cache.conditional_headers(meta)
+        
+        response = self._request(url, headers)
+        if response.status_code == 304 and cached:
+            self.cache.count('not_modified')
+            self.cache.revalidated(url, meta, response)
+            return body, meta['encoding']
+        response.raise_for_status()
+        self.cache.count('miss')
+        self.cache.store(url, response)
+        return response.content, declared_encoding(response)
+    
+    def _stream(self, url: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Descarga sin cargar el cuerpo entero en memoria (sitemaps, sin caché).
+
+        Los reintentos de _request cubren hasta que empieza el cuerpo; un corte a
+        mitad de la descarga no se reintenta.
+        """
+        with self._request(url, stream=True) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size)
+            # .xml.gz servidos sin Content-Encoding llegan comprimidos
+            if url.endswith('.gz') and response.headers.get('Content-Encoding') != 'gzip':
+                chunks = gunzip_chunks(chunks)
+            for chunk in chunks:
+                metrics.inc('scrape_bytes_downloaded_total', len(chunk))
+                yield chunk
+    
+    def log_stats(self):
+        if self.cache and self._owns_cache:
+            self.cache.log_stats()
+        self.dates.log_stats()
+        if isinstance(self.rate_limiter, AdaptiveRateLimiter) and (rates := self.rate_limiter.rates()):
+            summary = ", ".join(f"{host}: {rate:.2f}/s" for host, rate in rates.items())
+            self.logger.info(f"Tasa final por host -> {summary}")
+    
     def get_all_article_links(self, max_articles: int = None) -> List[str]:
-        all_links = []
-        current_url = BASE_URL
-        page_count = 0
+        all_links = list(self.iter_article_links(max_articles))
+        self.logger.info(f"Enlaces obtenidos: {len(all_links)}")
+        return all_links
+    
+    def iter_article_links(self, max_articles: int = None, incremental: bool = False) -> Iterator[str]:
+        for links, _, _ in self._iter_link_pages(max_articles, incremental):
+            yield from links
+    
+    def _iter_link_pages(self, max_articles: int = None, incremental: bool = False,
+                         start_url: str = None, page_count: int = 0) -> Iterator[Tuple[List[str], Optional[str], int]]:
+        """Recorre el listado desde `start_url` y produce (enlaces nuevos, página siguiente, páginas recorridas).
         
-        while page_count < MAX_PAGES:
-            soup = self._get_soup(current_url)
+        La página siguiente es None cuando la paginación terminó, y es la misma
+        página si `max_articles` la cortó. Si falla la descarga de una página, el
+        generador se corta sin producirla.
+        """
+        seen = set()
+        found = 0
+        current_url = start_url or self.base_url
+        
+        while page_count < self.max_pages:
+            soup = self._get_soup(current_url, self.listing_scope)
             if not soup:
-                break
+                return
             
             page_links = []
-            for selector in SELECTORS["article_links"]:
+            for selector in self.selectors["article_links"]:
                 links = [urljoin(current_url, a['href']) 
                         for a in soup.select(selector) if a.get('href')]
                 if links:
                     page_links = links
                     break
             
-            new_links = [link for link in page_links if link not in all_links]
-            if max_articles:
-                new_links = new_links[:max_articles - len(all_links)]
-            
-            all_links.extend(new_links)
-            if max_articles and len(all_links) >= max_articles:
-                break
-                
+            page_count += 1
             next_page = self._get_next_page(soup, current_url)
-            if not next_page or next_page == current_url:
-                break
+            if next_page == current_url or page_count >= self.max_pages:
+                next_page = None
+            
+            new_links = [link for link in dict.fromkeys(page_links) if link not in seen]
+            seen.update(new_links)
+            if incremental:
+                # Una sola consulta por página; si no hay nada nuevo el resto ya se conoce
+                known = self.db.get_existing_urls(new_links)
+                new_links = [link for link in new_links if link not in known]
+                if not new_links:
+                    self.logger.info(f"Sin artículos nuevos en {current_url}, se detiene la paginación")
+                    yield [], None, page_count
+                    return
+            if max_articles and len(new_links) > max_articles - found:
+                # Página cortada por el límite: el cursor queda en ella para que
+                # --resume la vuelva a leer (el frontier descarta los repetidos)
+                new_links = new_links[:max_articles - found]
+                found += len(new_links)
+                yield new_links, current_url, page_count - 1
+                return
+            
+            found += len(new_links)
+            yield new_links, next_page, page_count
+            if not next_page or (max_articles and found >= max_articles):
+                return
             
             current_url = next_page
-            page_count += 1
+    
+    def _find_sitemap(self) -> Optional[Tuple[str, Iterator[SitemapEntry]]]:
+        for path in SITEMAP["urls"]:
+            url = urljoin(self.base_url, path)
+            entries = iter_sitemap(self._stream(url))
+            try:
+                first = next(entries)
+            except StopIteration:
+                continue
+            except Exception as e:
+                self.logger.debug(f"Sin sitemap en {url}: {type(e).__name__}")
+                continue
+            return url, chain([first], entries)
+        return None
+    
+    def iter_sitemap_urls(self) -> Iterator[Tuple[str, List[Tuple[str, Optional[datetime]]]]]:
+        """Recorre el sitemap del sitio y produce (sitemap, [(URL, lastmod)]) por cada urlset.
         
-        logger.info(f"Enlaces obtenidos: {len(all_links)}")
-        return all_links
+        En un índice solo se siguen los hijos que coinciden con SITEMAP["include"],
+        o todos si ninguno coincide.
+        """
+        found = self._find_sitemap()
+        if not found:
+            raise RuntimeError(f"No se encontró un sitemap en {self.base_url}")
+        root, entries = found
+        
+        urls, children = [], []
+        for kind, loc, lastmod in entries:
+            (children if kind == 'sitemap' else urls).append((urljoin(root, loc), lastmod))
+        if urls:
+            yield root, urls
+        
+        if children:
+            include = re.compile(SITEMAP["include"])
+            selected = [loc for loc, _ in children if include.search(loc)] or [loc for loc, _ in children]
+            self.logger.info(f"Índice de sitemaps {root}: se siguen {len(selected)} de {len(children)}")
+            for child in selected:
+                try:
+                    yield child, [(urljoin(child, loc), lastmod)
+                                  for kind, loc, lastmod in iter_sitemap(self._stream(child)) if kind == 'url']
+                except Exception as e:
+                    self.logger.error(f"Error leyendo el sitemap {child}: {type(e).__name__}")
+    
+    def _iter_sitemap_pages(self, max_articles: int = None,
+                            refresh: bool = False) -> Iterator[Tuple[List[str], Optional[str], int]]:
+        """Como _iter_link_pages, pero cada "página" es un sitemap y solo se producen URLs nuevas
+        o con lastmod posterior al guardado.
+        """
+        found = 0
+        pages = 0
+        for sitemap_url, entries in self.iter_sitemap_urls():
+            pages += 1
+            stored = self.db.get_lastmods(loc for loc, _ in entries)
+            links = []
+            for loc, lastmod in entries:
+                if refresh or loc not in stored or (lastmod and lastmod > stored[loc]):
+                    links.append(loc)
+                    if lastmod:
+                        self._lastmods[loc] = lastmod
+            self.logger.info(f"{sitemap_url}: {len(entries)} URLs, {len(links)} nuevas o modificadas")
+            if max_articles:
+                links = links[:max_articles - found]
+            found += len(links)
+            # Reanudar vuelve a leer los sitemaps: son pocas peticiones y la frontera descarta lo ya visto
+            yield links, self.base_url, pages
+            if max_articles and found >= max_articles:
+                return
+        yield [], None, pages
     
-    def _get_next_page(self, soup: BeautifulSoup, current_url: str) -> Optional[str]:
-        for selector in SELECTORS["next_page"]:
+    def _get_next_page(self, soup: Document, current_url: str) -> Optional[str]:
+        for selector in self.selectors["next_page"]:
             next_btn = soup.select_one(selector)
             if next_btn and next_btn.get('href'):
                 return urljoin(current_url, next_btn['href'])
         return None
     
     def extract_articles(self, urls: List[str]) -> List[Dict]:
-        articles = []
-        for url in urls:
-            if not self.db.article_exists(url):
-                if article := self._extract_article(url):
-                    self.db.save_article(article)
-                    articles.append(article)
-        return articles
+        writer = BatchWriter(self.db)
+        pending = [url for url in urls if not self.db.article_exists(url)]
+        # Las descargas van en paralelo, pero se guardan en el orden original
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for article in executor.map(self._extract_article, pending):
+                if article:
+                    writer.add(article)
+        writer.flush()
+        return writer.saved
+    
+    def crawl(self, max_articles: int = None, incremental: bool = False, refresh: bool = False,
+              resume: bool = False, discovery: str = 'listing', writer: Optional[BatchWriter] = None) -> List[Dict]:
+        """Pagina y extrae a la vez: los enlaces se procesan a medida que aparecen.
+        
+        Con `refresh` también se vuelven a descargar los artículos ya guardados;
+        solo se reescriben los que cambiaron. La frontera (URLs descubiertas y
+        cursor de la paginación) se guarda en la base; con `resume` se continúa
+        el rastreo anterior en lugar de empezar desde la primera página. Con
+        discovery='sitemap' los enlaces salen del sitemap en lugar del listado.
+        Con un `writer` compartido (frontier=True) varios rastreos guardan a
+        través del mismo escritor y se devuelve todo lo que guardó.
+        """
+        if discovery not in DISCOVERY_MODES:
+            raise ValueError(f"Modo de descubrimiento desconocido: {discovery}")
+        state = self.db.get_crawl_state(self.base_url) if resume else None
+        if resume and state is None:
+            self.logger.warning("No hay un rastreo previo para reanudar; se empieza desde el principio")
+        
+        links = queue.Queue()
+        if state:
+            cursor, pages = state
+            for url in self.db.pending_frontier_urls(self.base_url):
+                links.put(url)
+            self.logger.info(f"Reanudando rastreo: {links.qsize()} URLs pendientes, "
+                        f"paginación en {cursor or 'fin del listado'}")
+        else:
+            self.db.start_crawl(self.base_url)
+            cursor, pages = self.base_url, 0
+        
+        producer = threading.Thread(
+            target=self._produce_links,
+            args=(links, max_articles, incremental, refresh, discovery, cursor, pages),
+            daemon=True
+        )
+        producer.start()
+        
+        writer = writer or BatchWriter(self.db, frontier=True)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                while True:
+                    self._save_completed(pending, writer)
+                    try:
+                        url = links.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if url is _END_OF_LINKS:
+                        break
+                    # En modo incremental y con sitemap el productor ya descartó las URLs conocidas
+                    if incremental or refresh or discovery == 'sitemap' or not self.db.article_exists(url):
+                        pending.append(executor.submit(self._attempt, url))
+                    else:
+                        writer.finish(url)
+                self._save_completed(pending, writer, wait=True)
+                self._retry_failed(executor, pending, writer)
+            finally:
+                # Ante una interrupción se guarda lo terminado y se descarta lo que no empezó
+                for future in pending:
+                    future.cancel()
+                writer.flush()
+        
+        producer.join()
+        self._log_frontier()
+        return writer.saved
+    
+    def _retry_failed(self, executor: ThreadPoolExecutor, pending: deque, writer: BatchWriter):
+        # Reintenta en esta misma ejecución las URLs fallidas a medida que vence su espera
+        while True:
+            writer.flush()
+            due = self.db.pending_frontier_urls(self.base_url, due_before=datetime.now())
+            if not due:
+                next_attempt = self.db.next_frontier_attempt(self.base_url)
+                if next_attempt is None:
+                    return
+                time.sleep(max(0.0, (next_attempt - datetime.now()).total_seconds()))
+                continue
+            self.logger.info(f"Reintentando {len(due)} URLs fallidas")
+            pending.extend(executor.submit(self._attempt, url) for url in due)
+            self._save_completed(pending, writer, wait=True)
+    
+    def _log_frontier(self):
+        counts = self.db.count_frontier(self.base_url)
+        if counts.get('failed'):
+            self.logger.warning(f"{counts['failed']} URLs fallaron en todos los intentos; "
+                           f"quedan registradas en la tabla crawl_frontier con su último error")
+        cursor, _ = self.db.get_crawl_state(self.base_url)
+        if cursor:
+            self.logger.warning(f"La paginación quedó en {cursor}; use --resume para continuar")
+    
+    def _produce_links(self, links: queue.Queue, max_articles: Optional[int], incremental: bool, refresh: bool,
+                       discovery: str, cursor: Optional[str], pages: int):
+        count = 0
+        try:
+            if cursor:
+                if discovery == 'sitemap':
+                    link_pages = self._iter_sitemap_pages(max_articles, refresh)
+                else:
+                    link_pages = self._iter_link_pages(max_articles, incremental, cursor, pages)
+                for page_links, next_page, pages in link_pages:
+                    # El cursor avanza junto con las URLs de la página: reanudar no pierde ni repite páginas
+                    for url in self.db.add_to_frontier(self.base_url, page_links, next_page, pages):
+                        links.put(url)
+                    count += len(page_links)
+        except Exception as e:
+            self.logger.error(f"Error buscando enlaces: {str(e)}")
+        finally:
+            self.logger.info(f"Enlaces obtenidos: {count}")
+            links.put(_END_OF_LINKS)
+    
+    def _save_completed(self, pending: deque, writer: BatchWriter, wait: bool = False):
+        # Solo se toma la cabeza de la cola para respetar el orden de descubrimiento
+        while pending and (wait or pending[0].done()):
+            url, article, error = pending.popleft().result()
+            if article:
+                writer.add(article)
+            writer.finish(url, error)
+        writer.flush_if_stale()
+    
+    def _attempt(self, url: str) -> Tuple[str, Optional[Dict], Optional[str]]:
+        try:
+            article = self._scrape_article(url)
+            if lastmod := self._lastmods.pop(url, None):
+                article['lastmod'] = lastmod
+            return url, article, None
+        except Exception as e:
+            self.logger.error(f"Error en {url}: {type(e).__name__}")
+            return url, None, f"{type(e).__name__}: {e}"
     
     def _extract_article(self, url: str) -> Optional[Dict]:
-        soup = self._get_soup(url)
-        if not soup:
-            return None
-            
         try:
-            content = ""
-            for selector in SELECTORS["content"]:
-                if element := soup.select_one(selector):
-                    content = "\n".join([p.text.strip() for p in element.find_all("p")])
-                    break
-            
-            date_str = ""
-            for selector in SELECTORS["date"]:
-                if element := soup.select_one(selector):
-                    date_str = element.get('datetime') or element.text.strip()
-                    break
-            
-            parsed_date = dateparser.parse(
-                date_str, 
-                languages=['es'],
-                settings={'DATE_ORDER': 'DMY'}
-            )
-            
-            return {
-                "title": self._safe_extract(soup, SELECTORS["title"]),
-                "content": content or "Contenido no disponible",
-                "date": parsed_date.date().isoformat() if parsed_date else "",
-                "url": url
-            }
+            return self._scrape_article(url)
         except Exception as e:
-            logger.error(f"Error procesando {url}: {str(e)}")
+            self.logger.error(f"Error procesando {url}: {type(e).__name__}")
             return None
     
-    def _safe_extract(self, soup: BeautifulSoup, selectors: list) -> str:
+    @metrics.timed('scrape_extract_seconds')
+    def _scrape_article(self, url: str) -> Dict:
+        soup = self._load(url, self.article_scope)
+        
+        content = ""
+        for selector in self.selectors["content"]:
+            if element := soup.select_one(selector):
+                content = "\n".join([p.text.strip() for p in element.find_all("p")])
+                break
+        
+        date_str = ""
+        for selector in self.selectors["date"]:
+            if element := soup.select_one(selector):
+                date_str = element.get('datetime') or element.text.strip()
+                break
+        
+        return {
+            "title": self._safe_extract(soup, self.selectors["title"]),
+            "content": content or "Contenido no disponible",
+            "date": self.dates.normalize(date_str),
+            "url": url,
+            "site": self.site
+        }
+    
+    def _safe_extract(self, soup: Document, selectors: list) -> str:
         for selector in selectors:
             if element := soup.select_one(selector):
                 return element.text.strip()
-        return ""
\ No newline at end of file
+        return ""
+
+def crawl_sites(db: DatabaseManager, profiles: List[Dict], concurrency: int = 1, use_cache: bool = True,
+                discovery: Optional[str] = None, **crawl_kwargs) -> Counter:
+    """Rastrea varios sitios a la vez: un hilo por sitio, cada uno con su pool de descargas
+    y su límite de tasa, todos guardando a través de un único BatchWriter.
+    
+    Devuelve la cantidad de artículos nuevos o actualizados por sitio.
+    """
+    writer = BatchWriter(db, frontier=True)
+    # Una sola caché para todos: el límite de tamaño y la expulsión LRU son del directorio entero
+    cache = build_response_cache() if use_cache else None
+    
+    def crawl_site(profile: Dict):
+        scraper = BlogScraper.for_site(db, profile, concurrency=concurrency, use_cache=use_cache, cache=cache)
+        scraper.crawl(discovery=discovery or profile["discovery"], writer=writer, **crawl_kwargs)
+        scraper.log_stats()
+    
+    with ThreadPoolExecutor(max_workers=len(profiles)) as executor:
+        futures = {executor.submit(crawl_site, profile): profile["name"] for profile in profiles}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error rastreando {futures[future]}: {str(e)}")
+    writer.flush()
+    if cache:
+        cache.log_stats()
+    return Counter(article["site"] for article in writer.saved)
@@ -0,0 +1,58 @@
+import logging
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+from xml.etree.ElementTree import XMLPullParser
+
+logger = logging.getLogger(__name__)
+
+# Entrada de un sitemap: ('sitemap', loc, lastmod) en un índice, ('url', loc, lastmod) en un urlset
+SitemapEntry = Tuple[str, str, Optional[datetime]]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Convierte un <lastmod> W3C (fecha o fecha y hora) a datetime local sin zona."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # updated_at se guarda en hora local sin zona
+    if parsed.tzinfo:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def gunzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    yield decompressor.flush()
+
+
+def iter_sitemap(chunks: Iterable[bytes]) -> Iterator[SitemapEntry]:
+    """Parsea un sitemap o índice de sitemaps a medida que llegan los bytes.
+
+    Cada <url>/<sitemap> se descarta al leerlo, así que la memoria no crece con
+    el tamaño del archivo.
+    """
+    parser = XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _read_entries(parser)
+    parser.close()
+    yield from _read_entries(parser)
+
+
+def _read_entries(parser: XMLPullParser) -> Iterator[SitemapEntry]:
+    for _, element in parser.read_events():
+        kind = element.tag.rsplit('}', 1)[-1]
+        if kind not in ('url', 'sitemap'):
+            continue
+        # {*} acepta las etiquetas con o sin el espacio de nombres de sitemaps.org
+        loc = (element.findtext('{*}loc') or '').strip()
+        lastmod = element.findtext('{*}lastmod')
+        element.clear()
+        if loc:
+            yield kind, loc, parse_lastmod(lastmod)
@@ -0,0 +1,76 @@
+import glob
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from config import BASE_URL, DEFAULT_SITE, MAX_PAGES, RATE_LIMIT, SELECTORS, SITES_DIR
+
+logger = logging.getLogger(__name__)
+
+# Claves que puede definir un perfil; selectors y rate_limit se combinan con los de config.py
+PROFILE_KEYS = {"base_url", "max_pages", "discovery", "selectors", "rate_limit"}
+
+
+def default_profile() -> Dict:
+    """Perfil del sitio configurado en config.py."""
+    return {
+        "name": DEFAULT_SITE,
+        "base_url": BASE_URL,
+        "max_pages": MAX_PAGES,
+        "discovery": "listing",
+        "selectors": SELECTORS,
+        "rate_limit": RATE_LIMIT
+    }
+
+
+def load_profile(path: str) -> Dict:
+    """Lee un perfil JSON; el nombre del sitio es el del archivo sin extensión."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if not data.get("base_url"):
+        raise ValueError(f"El perfil {name} no define base_url")
+    if unknown := set(data) - PROFILE_KEYS:
+        logger.warning(f"Claves desconocidas en el perfil {name}: {', '.join(sorted(unknown))}")
+    if unknown := set(data.get("selectors", {})) - set(SELECTORS):
+        raise ValueError(f"Selectores desconocidos en el perfil {name}: {', '.join(sorted(unknown))}")
+
+    profile = default_profile()
+    profile.update({
+        "name": name,
+        "base_url": data["base_url"],
+        "max_pages": data.get("max_pages", MAX_PAGES),
+        "discovery": data.get("discovery", "listing"),
+        "selectors": {**SELECTORS, **data.get("selectors", {})},
+        "rate_limit": {**RATE_LIMIT, **data.get("rate_limit", {})}
+    })
+    rate_limit = profile["rate_limit"]
+    # El aumento aditivo recortaría la tasa configurada hasta max_rate
+    if rate_limit.get("adaptive") and (rate_limit.get("requests_per_second") or 0) > rate_limit["max_rate"]:
+        logger.warning(
+            f"El perfil {name} pide {rate_limit['requests_per_second']} peticiones/s, más que max_rate "
+            f"({rate_limit['max_rate']}); se usa max_rate = {rate_limit['requests_per_second']}"
+        )
+        rate_limit["max_rate"] = rate_limit["requests_per_second"]
+    return profile
+
+
+def available_sites(directory: str = SITES_DIR) -> Dict[str, str]:
+    return {
+        os.path.splitext(os.path.basename(path))[0]: path
+        for path in sorted(glob.glob(os.path.join(directory, "*.json")))
+    }
+
+
+def load_profiles(names: Optional[List[str]] = None, directory: str = SITES_DIR) -> List[Dict]:
+    """Carga los perfiles pedidos por nombre; sin nombres (o con "all"), todos los del directorio."""
+    available = available_sites(directory)
+    if not names or names == ["all"]:
+        names = list(available)
+    if missing := [name for name in names if name not in available]:
+        raise ValueError(
+            f"Perfiles no encontrados en {directory}/: {', '.join(missing)} "
+            f"(disponibles: {', '.join(available) or 'ninguno'})"
+        )
+    return [load_profile(available[name]) for name in names]
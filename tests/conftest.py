@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "articles.db"))
+    yield manager
+    manager.engine.dispose()
+
+
+def make_article(i, content=None, **extra):
+    return {
+        'title': f"Artículo {i}",
+        'content': content or f"Contenido del artículo {i} sobre tomates y pimientos.",
+        'url': f"https://example.com/articulo-{i}/",
+        'date': "2023-03-15",
+        **extra
+    }
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+import database
+from conftest import make_article
+from database import CompressedText, compress_text, decompress_text, fts_query, resolve_codec
+
+TEXT = "El tomate necesita sol directo y riego constante. " * 40
+
+CODECS = [
+    None,
+    "zlib",
+    pytest.param("zstd", marks=pytest.mark.skipif(database.zstandard is None, reason="zstandard no instalado")),
+]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip(codec):
+    stored = compress_text(TEXT, codec)
+
+    assert decompress_text(stored) == TEXT
+    if codec:
+        assert isinstance(stored, bytes) and len(stored) < len(TEXT)
+    else:
+        assert stored == TEXT
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_column_type(codec):
+    column = CompressedText(codec)
+
+    assert column.process_result_value(column.process_bind_param(TEXT, None), None) == TEXT
+    # Filas guardadas antes de la compresión
+    assert column.process_result_value("texto plano", None) == "texto plano"
+
+
+def test_short_text_stays_plain():
+    assert compress_text("corto", "zlib") == "corto"
+
+
+def test_unknown_prefix():
+    with pytest.raises(ValueError):
+        decompress_text(b"x123")
+
+
+def test_resolve_codec(monkeypatch):
+    assert resolve_codec("none") is None
+    assert resolve_codec("zlib") == "zlib"
+    with pytest.raises(ValueError):
+        resolve_codec("lz4")
+
+    monkeypatch.setattr(database, "zstandard", None)
+    assert resolve_codec("auto") == "zlib"
+    assert resolve_codec("zstd") == "zlib"
+    with pytest.raises(RuntimeError):
+        decompress_text(b"s" + b"\x28\xb5\x2f\xfd")
+
+
+def stored(db):
+    with sqlite3.connect(db.engine.url.database) as conn:
+        return conn.execute(
+            "SELECT url, typeof(content), content_hash, updated_at FROM articles ORDER BY id"
+        ).fetchall()
+
+
+@pytest.mark.parametrize("codec", [c for c in CODECS if c is not None])
+def test_compress_content_in_place_and_back(db, codec):
+    db.save_articles([make_article(i, content=f"{i}. {TEXT}") for i in range(3)])
+    before = stored(db)
+
+    rewritten, size_before, size_after = db.compress_content(codec)
+    db.vacuum()
+
+    assert rewritten == 3 and size_after < size_before
+    after = stored(db)
+    assert [row[1] for row in after] == ["blob"] * 3
+    # Ni el hash ni updated_at cambian: no es un cambio de contenido
+    assert [(r[0], r[2], r[3]) for r in after] == [(r[0], r[2], r[3]) for r in before]
+    assert [a['content'] for a in db.iter_articles()] == [f"{i}. {TEXT}" for i in range(3)]
+    assert len(db.search(fts_query("tomate"))) == 3
+
+    # Volver a correrlo no reescribe nada; con None se descomprime
+    assert db.compress_content(codec)[0] == 0
+    assert db.compress_content(None)[0] == 3
+    assert [row[1] for row in stored(db)] == ["text"] * 3
+
+
+def test_compressed_rows_are_upserted_by_hash(db):
+    db.save_articles([make_article(0, content=TEXT)])
+    db.compress_content("zlib")
+
+    assert db.save_articles([make_article(0, content=TEXT)]) == set()
+    assert db.save_articles([make_article(0, content="Otro contenido")]) == {make_article(0)['url']}
+    assert [a['content'] for a in db.iter_articles()] == ["Otro contenido"]
@@ -0,0 +1,72 @@
+import pytest
+
+import dates
+from dates import DateNormalizer
+
+
+@pytest.fixture
+def no_dateparser(monkeypatch):
+    def fail(value):
+        raise AssertionError(f"dateparser no debería usarse para {value!r}")
+    monkeypatch.setattr(dates, "_parse_with_dateparser", fail)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2023-03-15", "2023-03-15"),
+    ("2023-03-15T10:30:00-03:00", "2023-03-15"),
+    ("2023-03-15T13:30:00Z", "2023-03-15"),
+])
+def test_iso(no_dateparser, value, expected):
+    normalizer = DateNormalizer()
+    assert normalizer.normalize(value) == expected
+    assert normalizer.stats == {"iso": 1}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("15/03/2023", "2023-03-15"),
+    ("5.3.2023", "2023-03-05"),
+    ("2023/03/15", "2023-03-15"),
+    ("15 de marzo de 2023", "2023-03-15"),
+    ("miércoles, 15 de Marzo de 2023", "2023-03-15"),
+    ("1 setiembre, 2020", "2020-09-01"),
+])
+def test_fixed_formats(no_dateparser, value, expected):
+    normalizer = DateNormalizer()
+    assert normalizer.normalize(value) == expected
+    assert normalizer.stats == {"formato fijo": 1}
+
+
+def test_memo_skips_parsing(no_dateparser):
+    normalizer = DateNormalizer()
+    normalizer.normalize("15/03/2023")
+    assert normalizer.normalize("15/03/2023") == "2023-03-15"
+    assert normalizer.stats == {"formato fijo": 1, "memo": 1}
+
+
+def test_empty():
+    normalizer = DateNormalizer()
+    assert normalizer.normalize("  ") == ""
+    assert normalizer.stats == {"vacía": 1}
+
+
+def test_falls_back_to_dateparser(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dates, "_parse_with_dateparser",
+                        lambda value: calls.append(value) or dates.date(2023, 3, 15))
+    normalizer = DateNormalizer()
+    assert normalizer.normalize("hace dos semanas") == "2023-03-15"
+    assert calls == ["hace dos semanas"]
+    assert normalizer.stats == {"dateparser": 1}
+
+
+def test_invalid_fixed_format_goes_to_dateparser(monkeypatch):
+    # 31/02 coincide con el formato fijo pero no es una fecha válida
+    monkeypatch.setattr(dates, "_parse_with_dateparser", lambda value: None)
+    normalizer = DateNormalizer()
+    assert normalizer.normalize("31/02/2023") == ""
+    assert normalizer.stats == {"sin reconocer": 1}
+
+
+def test_real_dateparser():
+    pytest.importorskip("dateparser")
+    assert DateNormalizer().normalize("marzo 15, 2023") == "2023-03-15"
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import FRONTIER
+
+SITE = "https://example.com/"
+
+
+def urls(*numbers):
+    return [f"{SITE}articulo-{n}/" for n in numbers]
+
+
+def test_add_returns_only_new_urls_and_moves_the_cursor(db):
+    db.start_crawl(SITE)
+    assert db.add_to_frontier(SITE, urls(1, 2), f"{SITE}page/2/", 1) == urls(1, 2)
+    assert db.add_to_frontier(SITE, urls(2, 3), f"{SITE}page/3/", 2) == urls(3)
+
+    assert db.get_crawl_state(SITE) == (f"{SITE}page/3/", 2)
+    assert db.pending_frontier_urls(SITE) == urls(1, 2, 3)
+
+
+def test_start_crawl_resets_only_its_site(db):
+    other = "https://otro.example.com/"
+    db.start_crawl(SITE)
+    db.start_crawl(other)
+    db.add_to_frontier(SITE, urls(1), None, 1)
+    db.add_to_frontier(other, [f"{other}a/"], None, 1)
+
+    db.start_crawl(SITE)
+
+    assert db.pending_frontier_urls(SITE) == []
+    assert db.get_crawl_state(SITE) == (SITE, 0)
+    assert db.pending_frontier_urls(other) == [f"{other}a/"]
+
+
+def test_done_and_failed_urls(db):
+    db.start_crawl(SITE)
+    db.add_to_frontier(SITE, urls(1, 2, 3), None, 1)
+
+    before = datetime.now()
+    db.update_frontier(urls(1), {urls(2)[0]: "Timeout"})
+
+    assert db.pending_frontier_urls(SITE) == urls(2, 3)
+    # El fallo se reintenta más tarde, no en la próxima vuelta
+    assert db.pending_frontier_urls(SITE, due_before=before) == []
+    retry_at = db.next_frontier_attempt(SITE)
+    assert retry_at >= before + timedelta(seconds=FRONTIER["retry_backoff"])
+    assert db.pending_frontier_urls(SITE, due_before=retry_at) == urls(2)
+    assert db.count_frontier(SITE) == {'done': 1, 'pending': 2}
+
+
+def test_url_fails_after_max_attempts(db):
+    db.start_crawl(SITE)
+    db.add_to_frontier(SITE, urls(1), None, 1)
+
+    for _ in range(FRONTIER["max_attempts"]):
+        db.update_frontier([], {urls(1)[0]: "HTTPError: 500"})
+
+    assert db.pending_frontier_urls(SITE) == []
+    assert db.next_frontier_attempt(SITE) is None
+    assert db.count_frontier(SITE) == {'failed': 1}
+
+
+@pytest.fixture
+def blog():
+    from benchmarks.fixture_server import FixtureBlog, serve
+    blog = FixtureBlog(45, per_page=10)
+    server, base_url = serve(blog)
+    blog.base_url = base_url
+    yield blog
+    server.shutdown()
+
+
+def scraper(db, blog):
+    from scraper import BlogScraper
+    return BlogScraper(db, concurrency=2, use_cache=False, base_url=blog.base_url,
+                       max_pages=blog.pages, rate_limit=None)
+
+
+def test_resume_after_max_articles_cuts_a_page(db, blog):
+    scraper(db, blog).crawl(max_articles=12)
+    assert db.count_articles() == 12
+    cursor, _ = db.get_crawl_state(blog.base_url)
+    assert cursor is not None
+
+    scraper(db, blog).crawl(resume=True)
+
+    assert db.count_articles() == 45
+    assert db.get_crawl_state(blog.base_url) == (None, blog.pages)
+    assert db.count_frontier(blog.base_url) == {'done': 45}
+
+
+def test_resume_retries_pending_urls(db, blog):
+    db.start_crawl(blog.base_url)
+    pending = [f"{blog.base_url}articulo-{n}/" for n in range(3)]
+    db.add_to_frontier(blog.base_url, pending, None, blog.pages)
+
+    scraper(db, blog).crawl(resume=True)
+
+    assert db.count_articles() == 3
+    assert db.count_frontier(blog.base_url) == {'done': 3}
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from conftest import make_article
+from database import FTS_TABLE, DatabaseManager, fts_query
+
+
+def fts_rows(db):
+    with sqlite3.connect(db.engine.url.database) as conn:
+        return conn.execute(f"SELECT rowid, title, content FROM {FTS_TABLE} ORDER BY rowid").fetchall()
+
+
+def test_new_articles_are_indexed(db):
+    db.save_articles([make_article(0, content="Cómo podar un limonero")])
+    db.save_article(make_article(1, content="Riego por goteo"))
+
+    assert [r['url'] for r in db.search(fts_query("limonero"))] == [make_article(0)['url']]
+    assert [r['url'] for r in db.search(fts_query("goteo"))] == [make_article(1)['url']]
+
+
+def test_updated_article_replaces_its_index_row(db):
+    db.save_articles([make_article(0, content="Cómo podar un limonero")])
+    db.save_articles([make_article(0, content="Cómo injertar un naranjo")])
+
+    assert db.search(fts_query("limonero")) == []
+    assert len(db.search(fts_query("naranjo"))) == 1
+    assert len(fts_rows(db)) == 1
+
+
+def test_unchanged_article_keeps_its_index_row(db):
+    db.save_articles([make_article(i) for i in range(3)])
+    before = fts_rows(db)
+    db.save_articles([make_article(i) for i in range(3)])
+
+    assert fts_rows(db) == before
+
+
+def test_search_ignores_accents_and_ranks_title_first(db):
+    db.save_articles([
+        make_article(0, content="El pimiento necesita sol; también la albahaca."),
+        make_article(1, title="Albahaca en maceta", content="Una aromática fácil de cultivar.")
+    ])
+
+    results = db.search(fts_query("albahaca"))
+    assert [r['title'] for r in results] == ["Albahaca en maceta", "Artículo 0"]
+    assert "[albahaca]" in db.search(fts_query("albahaca"))[1]['snippet']
+    assert len(db.search(fts_query("aromatica"))) == 1
+
+
+def test_query_filter_for_generate(db):
+    db.save_articles([make_article(i, content=text) for i, text in enumerate(
+        ["Tomates en maceta", "Pimientos en maceta", "Tomates en tierra"])])
+
+    assert db.count_articles(query=fts_query("tomates maceta")) == 1
+    assert [a['content'] for a in db.iter_articles(query=fts_query("tomate*"))] == \
+        ["Tomates en maceta", "Tomates en tierra"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("driver-meanwell", '"driver-meanwell"'),
+    ("led's", '"led\'s"'),
+    ('dijo "hola"', '"dijo" """hola"""'),
+    ("tomat*", '"tomat"*'),
+    ("  AND  OR ", '"AND" "OR"'),
+])
+def test_fts_query_quotes_terms(db, text, expected):
+    assert fts_query(text) == expected
+    db.search(expected)  # no es un error de sintaxis de FTS5
+
+
+def test_index_is_built_for_databases_without_it(tmp_path):
+    path = str(tmp_path / "articles.db")
+    DatabaseManager(path).save_articles([make_article(i) for i in range(3)])
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"DROP TABLE {FTS_TABLE}")
+        conn.execute("PRAGMA user_version = 0")
+
+    db = DatabaseManager(path)
+    assert len(fts_rows(db)) == 3
+    assert len(db.search(fts_query("pimientos"))) == 3
@@ -0,0 +1,47 @@
+import sqlite3
+
+from conftest import make_article
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {url: (content_hash, updated_at) for url, content_hash, updated_at
+                in conn.execute("SELECT url, content_hash, updated_at FROM articles")}
+
+
+def test_inserts_new_articles(db):
+    written = db.save_articles([make_article(i) for i in range(3)])
+
+    assert written == {make_article(i)['url'] for i in range(3)}
+    assert db.count_articles() == 3
+
+
+def test_unchanged_articles_are_not_rewritten(db):
+    articles = [make_article(i) for i in range(3)]
+    db.save_articles(articles)
+    before = rows(db.engine.url.database)
+
+    assert db.save_articles(articles) == set()
+    assert rows(db.engine.url.database) == before
+
+
+def test_only_changed_articles_are_rewritten(db):
+    db.save_articles([make_article(i) for i in range(3)])
+    before = rows(db.engine.url.database)
+
+    changed = make_article(1, content="Contenido nuevo")
+    written = db.save_articles([make_article(0), changed, make_article(2)])
+
+    after = rows(db.engine.url.database)
+    assert written == {changed['url']}
+    assert after[changed['url']] != before[changed['url']]
+    assert {url: row for url, row in after.items() if url != changed['url']} == \
+        {url: row for url, row in before.items() if url != changed['url']}
+    assert [a['content'] for a in db.iter_articles(id_from=2, id_to=2)] == ["Contenido nuevo"]
+
+
+def test_batches_smaller_than_input(db):
+    written = db.save_articles([make_article(i) for i in range(25)], batch_size=10)
+
+    assert len(written) == 25
+    assert db.count_articles() == 25
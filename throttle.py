@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que indican que el servidor pide bajar el ritmo
+THROTTLE_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def set_rate(self, rate: float):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = rate
+
+    def pause(self, seconds: float):
+        # Nadie obtiene tokens hasta que pase la pausa (Retry-After)
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class HostRateLimiter:
+    """Limita las peticiones por host con un token bucket independiente para cada uno."""
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def wait(self, url: str):
+        # Sin tasa configurada no hay límite (útil para pruebas locales)
+        if not self.rate:
+            return
+        self._bucket(url).acquire()
+
+    def record(self, url: str, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """Un límite fijo no se adapta: solo respeta Retry-After."""
+        if self.rate and retry_after:
+            self._bucket(url).pause(retry_after)
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    """Límite por host que se ajusta con AIMD según la latencia y las respuestas 429/503.
+
+    Cada respuesta rápida suma `increase / tasa`, unas `increase` peticiones/segundo
+    por cada segundo sin problemas, hasta `max_rate`. Una respuesta 429/503, un
+    timeout o una respuesta más lenta que `target_latency` multiplica la tasa por
+    `decrease`, como mucho una vez por segundo para que las respuestas que ya
+    estaban en vuelo no la hundan de golpe. Nunca baja de `min_rate`.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.5, max_rate: float = 10.0,
+                 increase: float = 0.25, decrease: float = 0.5, target_latency: float = 2.0):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self._last_decrease: Dict[str, float] = {}
+
+    def record(self, url: str, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        bucket = self._bucket(url)
+        if retry_after:
+            bucket.pause(retry_after)
+        host = urlparse(url).netloc
+        # Sin estado = timeout: el servidor no llegó a responder
+        if status is None or status in THROTTLE_STATUSES or latency > self.target_latency:
+            now = time.monotonic()
+            with self._lock:
+                if now - self._last_decrease.get(host, 0.0) < 1.0:
+                    return
+                self._last_decrease[host] = now
+            rate = max(self.min_rate, bucket.rate * self.decrease)
+            logger.debug(f"{host}: tasa reducida a {rate:.2f} peticiones/s (estado {status}, {latency:.2f} s)")
+        elif status is not None and status < 400:
+            rate = min(self.max_rate, bucket.rate + self.increase / bucket.rate)
+        else:
+            return
+        bucket.set_rate(rate)
+
+    def rates(self) -> Dict[str, float]:
+        with self._lock:
+            return {host: bucket.rate for host, bucket in self._buckets.items()}
+
+
+def parse_retry_after(value: Optional[str], limit: float = 300.0) -> Optional[float]:
+    """Segundos a esperar según Retry-After (segundos o fecha HTTP), acotados a `limit`."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), limit) or None